@@ -3,3 +3,29 @@ API package for SHL Assessment Recommendation System
 """
 
 __version__ = "1.0.0"
+
+# Heavy names are resolved on first access (PEP 562) so importing the
+# package does not pull in the recommender, FAISS or the embedding model
+_LAZY_ATTRS = {
+    'RAGRecommender': 'src.recommender',
+    'validate_query': 'src.utils',
+    'format_recommendations': 'src.utils',
+    'is_url': 'src.utils',
+    'fetch_jd_from_url': 'src.utils',
+}
+
+
+def __getattr__(name):
+    """Lazily import heavy project attributes on first use"""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
@@ -3,17 +3,31 @@ Flask API for SHL Assessment Recommendation System
 Provides REST endpoints for health check and recommendations
 """
 
-from flask import Flask, request, jsonify, send_from_directory
-from flask_cors import CORS
 import os
 import sys
-import logging
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.recommender import RAGRecommender
-from src.utils import validate_query, format_recommendations, is_url, fetch_jd_from_url
+# Size OpenMP for this worker before any import can pull in numpy
+from src.cpu_threads import configure_omp
+configure_omp()
+
+from flask import Flask, Response, request, jsonify, send_from_directory
+from flask_cors import CORS
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
+import re
+import json
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Optional, TYPE_CHECKING
+
+from api.health import health_app
+
+if TYPE_CHECKING:
+    from src.recommender import RAGRecommender
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,35 +35,215 @@ logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__, static_folder='../frontend', static_url_path='')
-CORS(app)
+# Only the recommendation endpoints are called cross-origin
+CORS(app, resources={r"/recommend.*": {"origins": "*", "methods": ["POST"]}})
 
-# Initialize recommender
-logger.info("Initializing RAG Recommender...")
-try:
-    recommender = RAGRecommender()
-    logger.info("Recommender initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize recommender: {e}")
-    recommender = None
+# /health is answered by a bare WSGI app before Flask routing runs
+app.wsgi_app = DispatcherMiddleware(app.wsgi_app, {'/health': health_app})
 
+# Recommender is created lazily on the first /recommend call so that
+# worker boot and /health never pay for the model and index imports
+_recommender: Optional["RAGRecommender"] = None
+_semantic_cache = None
+_lock = threading.Lock()
 
-@app.route('/')
-def index():
-    """Serve the frontend"""
-    return send_from_directory(app.static_folder, 'index.html')
+# Same check as src.utils.is_url without lowercasing a copy of the query
+_URL_RE = re.compile(r'\s*https?://', re.I)
+
+# Upper bound on queries accepted by /recommend/batch
+MAX_BATCH_QUERIES = 32
+
+
+def get_recommender() -> Optional["RAGRecommender"]:
+    """Return the shared recommender, initializing it on first use"""
+    global _recommender, _semantic_cache
+    
+    if _recommender is not None:
+        return _recommender
+    
+    with _lock:
+        if _recommender is None:
+            logger.info("Initializing RAG Recommender...")
+            try:
+                from src.recommender import RAGRecommender
+                from src.semantic_cache import SemanticCache
+                # One semantic cache, shared with the recommender so batch
+                # and single requests fill and read the same layer
+                semantic_cache = SemanticCache()
+                recommender = RAGRecommender(semantic_cache=semantic_cache)
+                # The model and index load lazily; load them here so a
+                # failure leaves _recommender unset and requests get a 503
+                recommender.embedding_manager
+                _recommender = recommender
+                _semantic_cache = semantic_cache
+                _result_cache.clear()
+                logger.info("Recommender initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize recommender: {e}")
+    
+    return _recommender
 
 
-@app.route('/health', methods=['GET'])
-def health_check():
+def normalize_query(query: str) -> str:
     """
-    Health check endpoint
-    Returns API status
+    Normalize a query into the key used by the recommendation cache
+    
+    URLs are only stripped: their paths are case-sensitive, and keying on
+    the URL lets repeats skip fetching the JD again.
     """
-    response = {
-        'status': 'healthy'
-    }
+    query = query.strip()
+    if _URL_RE.match(query):
+        return query
+    return query.lower()[:2000]
+
+
+class JDFetchError(Exception):
+    """The job description behind a URL query could not be fetched"""
+
+
+class _ResultCache:
+    """Thread-safe LRU of formatted results keyed by (normalized query, k)"""
     
-    return jsonify(response), 200
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def get(self, key) -> Optional[tuple]:
+        """Cached result for key, or None"""
+        with self._lock:
+            result = self._data.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return result
+    
+    def put(self, key, result: tuple):
+        """Store a result, evicting the least recently used entry"""
+        with self._lock:
+            self._data[key] = result
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_result_cache = _ResultCache(maxsize=1024)
+
+
+def _query_text(norm_query: str) -> str:
+    """Text to search for a cache key: the fetched JD for URLs, else the key itself"""
+    if not _URL_RE.match(norm_query):
+        return norm_query
+    
+    from src.utils import fetch_jd_from_url
+    
+    logger.info(f"Query is a URL, fetching content: {norm_query}")
+    jd_text = fetch_jd_from_url(norm_query)
+    if not jd_text:
+        raise JDFetchError(norm_query)
+    logger.info(f"Extracted {min(len(jd_text), 2000)} characters from URL")
+    return normalize_query(jd_text[:2000])
+
+
+def parse_k(data: dict) -> Optional[int]:
+    """Requested number of recommendations clamped to 5..10, or None if k is not an integer"""
+    k = data.get('k', 10)
+    if isinstance(k, bool) or not isinstance(k, int):
+        return None
+    return max(5, min(10, k))
+
+
+def _format_result(recommendations) -> tuple:
+    """Format recommendations into the immutable cached form (JSON strings)"""
+    from src.utils import format_recommendations
+    
+    return tuple(json.dumps(r) for r in format_recommendations(recommendations))
+
+
+def _cached_recommend(norm_query: str, k: int) -> tuple:
+    """
+    Run the recommender and cache the formatted results
+    
+    Results are stored as JSON strings so the cached value stays immutable.
+    On an exact-string miss the recommender checks the shared semantic
+    cache, so paraphrased queries skip the vector search and LLM. A failed
+    LLM rerank is served in vector order but never cached, so one timeout
+    does not pin a degraded answer.
+    """
+    from src.recommender import RerankError
+    
+    key = (norm_query, k)
+    result = _result_cache.get(key)
+    if result is not None:
+        return result
+    
+    try:
+        recommendations = get_recommender().recommend(
+            _query_text(norm_query), k=k, raise_rerank_errors=True
+        )
+    except RerankError as e:
+        return _format_result(e.recommendations)
+    
+    result = _format_result(recommendations)
+    _result_cache.put(key, result)
+    return result
+
+
+# Identical queries already being computed: (normalized query, k) -> Future
+_inflight = {}
+_inflight_lock = threading.Lock()
+INFLIGHT_TIMEOUT = 60
+
+
+def _coalesced_recommend(norm_query: str, k: int) -> tuple:
+    """
+    Share one computation between concurrent identical requests
+    
+    The first request for a key computes the result; requests arriving
+    while it runs wait on the same Future instead of repeating the work.
+    """
+    key = (norm_query, k)
+    
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _inflight[key] = future
+    
+    if not is_leader:
+        return future.result(timeout=INFLIGHT_TIMEOUT)
+    
+    try:
+        result = _cached_recommend(norm_query, k)
+        future.set_result(result)
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+@app.route('/')
+def index():
+    """Serve the frontend"""
+    return send_from_directory(app.static_folder, 'index.html')
 
 
 @app.route('/recommend', methods=['POST'])
@@ -78,16 +272,18 @@ def recommend():
         "total_recommendations": 10
     }
     """
+    from src.utils import validate_query
+    
     try:
         # Validate request
-        if not request.is_json:
+        data = request.get_json(silent=True)
+        
+        if not isinstance(data, dict):
             return jsonify({
                 'error': 'Request must be JSON',
                 'status': 'error'
             }), 400
         
-        data = request.get_json()
-        
         if 'query' not in data:
             return jsonify({
                 'error': 'Missing required field: query',
@@ -104,40 +300,36 @@ def recommend():
             }), 400
         
         # Check if recommender is ready
-        if recommender is None:
+        rec = get_recommender()
+        if rec is None:
             return jsonify({
                 'error': 'Recommender not initialized. Please run scraper and embeddings first.',
                 'status': 'error'
             }), 503
         
-        # Check if query is a URL
-        if is_url(query):
-            logger.info(f"Query is a URL, fetching content: {query}")
-            jd_text = fetch_jd_from_url(query)
-            
-            if jd_text:
-                query = jd_text[:2000]  # Use first 2000 chars
-                logger.info(f"Extracted {len(query)} characters from URL")
-            else:
-                return jsonify({
-                    'error': 'Failed to fetch content from URL',
-                    'status': 'error'
-                }), 400
-        
         # Get number of recommendations (default 10, min 5, max 10)
-        k = data.get('k', 10)
-        k = max(5, min(10, k))
+        k = parse_k(data)
+        if k is None:
+            return jsonify({
+                'error': 'Invalid k. k must be an integer.',
+                'status': 'error'
+            }), 400
         
-        # Generate recommendations
+        # Generate recommendations; URL queries are fetched on a cache miss
         logger.info(f"Generating {k} recommendations for query: {query[:100]}...")
-        recommendations = recommender.recommend(query, k=k)
+        try:
+            cached = _coalesced_recommend(normalize_query(query), k)
+        except JDFetchError:
+            return jsonify({
+                'error': 'Failed to fetch content from URL',
+                'status': 'error'
+            }), 400
         
-        # Format response
-        response = {
-            'recommended_assessments': format_recommendations(recommendations)
-        }
+        # Cached entries are already serialized, so splice them into the
+        # body directly instead of parsing and re-encoding every response
+        body = '{"recommended_assessments": [' + ', '.join(cached) + ']}'
         
-        return jsonify(response), 200
+        return Response(body, status=200, mimetype='application/json')
         
     except Exception as e:
         logger.error(f"Error in /recommend endpoint: {e}", exc_info=True)
@@ -147,6 +339,162 @@ def recommend():
         }), 500
 
 
+@app.route('/warmup', methods=['POST'])
+def warmup():
+    """
+    Warm-up endpoint for the scheduled workflow (.github/workflows/warmup.yml)
+    
+    Loads the recommender and runs one query encoding so the next real
+    /recommend call skips model and index loading. No search is run.
+    """
+    rec = get_recommender()
+    if rec is not None:
+        rec.embed('warmup')
+    return jsonify({'status': 'warm' if rec is not None else 'cold'}), 200
+
+
+@app.route('/recommend/batch', methods=['POST'])
+def recommend_batch():
+    """
+    Batch recommendation endpoint
+    
+    Each query is handled as /recommend would (URL queries are fetched,
+    exact and semantic cache hits are served directly); the misses are
+    embedded in one model call and searched together.
+    
+    Request body:
+    {
+        "queries": ["Java developer ...", "Python analyst ..."],
+        "k": 10
+    }
+    
+    Response:
+    {
+        "results": [
+            {"query": "...", "recommended_assessments": [...]}
+        ]
+    }
+    """
+    from src.utils import validate_query
+    from src.recommender import RerankError
+    
+    try:
+        data = request.get_json(silent=True)
+        
+        if not isinstance(data, dict):
+            return jsonify({
+                'error': 'Request must be JSON',
+                'status': 'error'
+            }), 400
+        queries = data.get('queries')
+        
+        if not isinstance(queries, list) or not queries:
+            return jsonify({
+                'error': 'Missing required field: queries (non-empty list)',
+                'status': 'error'
+            }), 400
+        
+        if len(queries) > MAX_BATCH_QUERIES:
+            return jsonify({
+                'error': f'Too many queries. Maximum is {MAX_BATCH_QUERIES}.',
+                'status': 'error'
+            }), 400
+        
+        if not all(isinstance(q, str) and validate_query(q) for q in queries):
+            return jsonify({
+                'error': 'Invalid query. Each query must be non-empty and at least 3 characters.',
+                'status': 'error'
+            }), 400
+        
+        k = parse_k(data)
+        if k is None:
+            return jsonify({
+                'error': 'Invalid k. k must be an integer.',
+                'status': 'error'
+            }), 400
+        
+        rec = get_recommender()
+        if rec is None:
+            return jsonify({
+                'error': 'Recommender not initialized. Please run scraper and embeddings first.',
+                'status': 'error'
+            }), 503
+        
+        # Serve exact cache hits; repeated queries in the batch run once
+        keys = [normalize_query(q) for q in queries]
+        results = {}
+        misses = []
+        for key in keys:
+            if key in results:
+                continue
+            results[key] = _result_cache.get((key, k))
+            if results[key] is None:
+                misses.append(key)
+        
+        if misses:
+            try:
+                texts = [_query_text(key) for key in misses]
+            except JDFetchError as e:
+                return jsonify({
+                    'error': f'Failed to fetch content from URL: {e}',
+                    'status': 'error'
+                }), 400
+            
+            logger.info(f"Generating {k} recommendations for {len(misses)} of {len(queries)} queries")
+            batch = rec.recommend_batch(texts, k=k, return_rerank_errors=True)
+            
+            for key, recommendations in zip(misses, batch):
+                # Failed reranks are served in vector order but not cached
+                if isinstance(recommendations, RerankError):
+                    results[key] = _format_result(recommendations.recommendations)
+                else:
+                    results[key] = _format_result(recommendations)
+                    _result_cache.put((key, k), results[key])
+        
+        # Cached entries are already serialized; splice them into the body
+        body = '{"results": [' + ', '.join(
+            '{"query": ' + json.dumps(query) + ', "recommended_assessments": [' + ', '.join(results[key]) + ']}'
+            for query, key in zip(queries, keys)
+        ) + ']}'
+        
+        return Response(body, status=200, mimetype='application/json')
+        
+    except Exception as e:
+        logger.error(f"Error in /recommend/batch endpoint: {e}", exc_info=True)
+        return jsonify({
+            'error': f'Internal server error: {str(e)}',
+            'status': 'error'
+        }), 500
+
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """
+    Recommendation cache statistics endpoint
+    Returns hit/miss counters of the query caches and the LLM rerank gate
+    """
+    response = {
+        'hits': _result_cache.hits,
+        'misses': _result_cache.misses,
+        'maxsize': _result_cache.maxsize,
+        'currsize': len(_result_cache)
+    }
+    
+    if _semantic_cache is not None:
+        response['semantic'] = {
+            'hits': _semantic_cache.hits,
+            'misses': _semantic_cache.misses,
+            'maxsize': _semantic_cache.capacity,
+            'currsize': len(_semantic_cache),
+            'threshold': _semantic_cache.threshold
+        }
+    
+    if _recommender is not None:
+        response['llm_gate'] = _recommender.rerank_gate_stats()
+    
+    return jsonify(response), 200
+
+
 @app.route('/api/info', methods=['GET'])
 def api_info():
     """
@@ -160,6 +508,9 @@ def api_info():
         'endpoints': {
             'GET /health': 'Health check',
             'POST /recommend': 'Get assessment recommendations',
+            'POST /recommend/batch': 'Get recommendations for several queries',
+            'POST /warmup': 'Load the recommender ahead of traffic',
+            'GET /cache/stats': 'Recommendation cache statistics',
             'GET /api/info': 'API information'
         },
         'recommendation_details': {
@@ -0,0 +1,22 @@
+"""
+Minimal WSGI health check app
+Has no Flask or project imports so health probes never wait on app setup
+"""
+
+_BODY = b'{"status":"healthy"}'
+
+
+def health_app(environ, start_response):
+    """Answer GET/HEAD health probes with a static JSON body"""
+    if environ.get('REQUEST_METHOD') not in ('GET', 'HEAD'):
+        start_response('405 METHOD NOT ALLOWED', [
+            ('Content-Type', 'application/json'),
+            ('Allow', 'GET, HEAD'),
+        ])
+        return [b'{"error":"Method not allowed","status":"error"}']
+    
+    start_response('200 OK', [
+        ('Content-Type', 'application/json'),
+        ('Content-Length', str(len(_BODY))),
+    ])
+    return [_BODY]
@@ -3,27 +3,50 @@ Vercel-optimized Flask API for SHL Assessment Recommendation System
 Ultra-minimal version - NO external imports from project
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import os
 import json
+import re
+import heapq
+import pickle
+from bisect import bisect_right
+from collections import Counter, defaultdict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Initialize Flask app
 app = Flask(__name__)
-CORS(app)
+CORS(app, resources={r"/recommend": {"origins": "*", "methods": ["POST"]}})
 
-# Cache for assessments
-_assessments_cache = None
+# Catalog stored column-wise: response field -> list indexed by doc_id
+_catalog = None
+INDEX_FORMAT_VERSION = 2
 
+# Inverted index over whitespace tokens: token -> [(doc_id, tf), ...]
+_index = {}
+_doc_count = 0
 
-def get_data_path():
-    """Get the absolute path to data file"""
+# All index tokens joined by newlines, so a word is located in every
+# token with one C-level regex scan instead of a Python loop over tokens
+_vocab = []
+_vocab_blob = ''
+_vocab_starts = []
+_word_scores = {}
+_WORD_SCORES_MAX = 4096
+
+
+def _find_data_file(filename):
+    """Get the absolute path to a file in the data directory"""
     # Try multiple possible locations
     possible_paths = [
-        os.path.join(os.path.dirname(__file__), '..', 'data', 'scraped_data.json'),
-        os.path.join(os.getcwd(), 'data', 'scraped_data.json'),
-        '/var/task/data/scraped_data.json',  # Vercel Lambda path
-        'data/scraped_data.json'
+        os.path.join(os.path.dirname(__file__), '..', 'data', filename),
+        os.path.join(os.getcwd(), 'data', filename),
+        f'/var/task/data/{filename}',  # Vercel Lambda path
+        f'data/{filename}'
     ]
     
     for path in possible_paths:
@@ -33,52 +56,164 @@ def get_data_path():
     return possible_paths[0]  # Default to first option
 
 
-def load_assessments():
-    """Load assessments with error handling"""
-    global _assessments_cache
+def get_data_path():
+    """Get the absolute path to data file"""
+    return _find_data_file('scraped_data.json')
+
+
+def get_index_path():
+    """Get the absolute path to the prebuilt search index"""
+    return _find_data_file('index.pickle')
+
+
+def _to_columns(assessments):
+    """Convert assessment dicts into response-ready columns"""
+    return {
+        'url': [a.get('url', '') for a in assessments],
+        'name': [a.get('assessment_name', '') for a in assessments],
+        'adaptive_support': [a.get('adaptive_support', 'No') for a in assessments],
+        'description': [(a.get('description', '') or '')[:150] for a in assessments],
+        'duration': [a.get('duration', 0) for a in assessments],
+        'remote_support': [a.get('remote_support', 'Yes') for a in assessments],
+        'test_type': [a.get('test_type_full', a.get('category', 'Other')) for a in assessments],
+    }
+
+
+def save_index(path):
+    """Build the catalog columns and inverted index from scraped data and persist them"""
+    with open(get_data_path(), 'r', encoding='utf-8') as f:
+        assessments = json.load(f)
+    build_index(assessments)
+    
+    with open(path, 'wb') as f:
+        pickle.dump({
+            'version': INDEX_FORMAT_VERSION,
+            'columns': _to_columns(assessments),
+            'index': _index,
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return len(assessments)
+
+
+def _load_prebuilt_index():
+    """Load catalog columns and inverted index written by build_index.py"""
+    global _catalog
     
-    if _assessments_cache is not None:
-        return _assessments_cache
+    index_path = get_index_path()
+    if not os.path.exists(index_path):
+        return False
+    
+    try:
+        with open(index_path, 'rb') as f:
+            data = pickle.load(f)
+        if not isinstance(data, dict) or data.get('version') != INDEX_FORMAT_VERSION:
+            return False
+        columns, index = data['columns'], data['index']
+    except Exception:
+        return False
+    
+    _catalog = columns
+    _set_index(len(columns['url']), index)
+    return True
+
+
+def load_catalog():
+    """Load the catalog columns with error handling"""
+    global _catalog
+    
+    if _catalog is not None:
+        return _catalog
+    
+    # Prebuilt index skips JSON parsing and tokenization on cold start
+    if _load_prebuilt_index():
+        return _catalog
     
     try:
         data_path = get_data_path()
-        with open(data_path, 'r', encoding='utf-8') as f:
-            # Read in chunks to avoid memory issues
+        with open(data_path, 'rb') as f:
             content = f.read()
-            _assessments_cache = json.loads(content)
-        return _assessments_cache
+        # orjson parses bytes directly, skipping the text decode step
+        assessments = orjson.loads(content) if orjson else json.loads(content)
+        build_index(assessments)
+        # Only the columns are kept; the per-assessment dicts are released
+        _catalog = _to_columns(assessments)
+        return _catalog
     except Exception as e:
-        # Return empty list if can't load
-        return []
+        # Return empty catalog if can't load
+        return None
 
 
-def simple_recommend(query, k=10):
-    """Ultra-simple keyword matching"""
-    assessments = load_assessments()
+def _set_index(doc_count, index):
+    """Install an inverted index and derive the vocabulary scan buffer"""
+    global _index, _doc_count, _word_scores, _vocab, _vocab_blob, _vocab_starts
     
-    if not assessments:
-        return []
-    
-    query_lower = query.lower()
-    words = [w for w in query_lower.split() if len(w) > 3]
+    _index = index
+    _doc_count = doc_count
+    _word_scores = {}
     
-    # Score each assessment
-    scored = []
-    for assessment in assessments:
-        score = 0
+    _vocab = list(index)
+    _vocab_starts = []
+    offset = 0
+    for token in _vocab:
+        _vocab_starts.append(offset)
+        offset += len(token) + 1
+    _vocab_blob = '\n'.join(_vocab)
+
+
+def build_index(assessments):
+    """Build the token inverted index used by simple_recommend"""
+    index = defaultdict(list)
+    for doc_id, assessment in enumerate(assessments):
         text = f"{assessment.get('assessment_name', '')} {assessment.get('description', '')} {assessment.get('category', '')}".lower()
+        for token, tf in Counter(text.split()).items():
+            index[token].append((doc_id, tf))
+    
+    _set_index(len(assessments), dict(index))
+
+
+def _term_scores(word):
+    """
+    Return the sparse score vector {doc_id: hits} for a single query word
+    
+    A document's hits are the occurrences of word inside its tokens, which
+    equals the substring count because query words contain no whitespace.
+    """
+    scores = _word_scores.get(word)
+    if scores is None:
+        # Tokens are newline separated, so matches never span two tokens and
+        # per-token hit counts equal token.count(word)
+        token_hits = Counter(
+            bisect_right(_vocab_starts, m.start()) - 1
+            for m in re.finditer(re.escape(word), _vocab_blob)
+        )
         
-        # Simple word matching
-        for word in words:
-            if word in text:
-                score += text.count(word)
+        scores = {}
+        for token_id, occurrences in token_hits.items():
+            for doc_id, tf in _index[_vocab[token_id]]:
+                scores[doc_id] = scores.get(doc_id, 0) + occurrences * tf
         
-        if score > 0:
-            scored.append((assessment, score))
+        if len(_word_scores) >= _WORD_SCORES_MAX:
+            _word_scores.clear()
+        _word_scores[word] = scores
+    return scores
+
+
+def simple_recommend(query, k=10):
+    """Ultra-simple keyword matching, returns doc ids of the top k matches"""
+    if not load_catalog():
+        return []
     
-    # Sort and return top k
-    scored.sort(key=lambda x: x[1], reverse=True)
-    return [item[0] for item in scored[:k]]
+    query_lower = query.lower()
+    words = Counter(w for w in query_lower.split() if len(w) > 3)
+    
+    # Sum the cached per-term vectors, weighted by query term frequency
+    scores = {}
+    for word, weight in words.items():
+        for doc_id, hits in _term_scores(word).items():
+            scores[doc_id] = scores.get(doc_id, 0) + weight * hits
+    
+    # Return top k in O(N log k); ties keep catalog order via the key
+    top = heapq.nlargest(k, scores.items(), key=lambda x: (x[1], -x[0]))
+    return [doc_id for doc_id, score in top]
 
 
 @app.route('/health', methods=['GET'])
@@ -91,11 +226,12 @@ def health():
 def recommend():
     """Get recommendations"""
     try:
-        data = request.get_json()
-        if not data:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
             return jsonify({'error': 'Invalid request'}), 400
         
         query = data.get('query', '').strip()
+        
         if not query or len(query) < 3:
             return jsonify({'error': 'Invalid query'}), 400
         
@@ -104,27 +240,38 @@ def recommend():
         k = min(10, max(5, data.get('k', 10)))
         
         # Get recommendations
-        recommendations = simple_recommend(query, k)
+        doc_ids = simple_recommend(query, k)
         
-        # Format response
+        # Format response from the catalog columns
+        catalog = _catalog
         result = []
-        for rec in recommendations:
+        for i in doc_ids:
             result.append({
-                'url': rec.get('url', ''),
-                'name': rec.get('assessment_name', ''),
-                'adaptive_support': rec.get('adaptive_support', 'No'),
-                'description': (rec.get('description', '') or '')[:150],
-                'duration': rec.get('duration', 0),
-                'remote_support': rec.get('remote_support', 'Yes'),
-                'test_type': [rec.get('test_type_full', rec.get('category', 'Other'))]
+                'url': catalog['url'][i],
+                'name': catalog['name'][i],
+                'adaptive_support': catalog['adaptive_support'][i],
+                'description': catalog['description'][i],
+                'duration': catalog['duration'][i],
+                'remote_support': catalog['remote_support'][i],
+                'test_type': [catalog['test_type'][i]]
             })
         
-        return jsonify({'recommended_assessments': result}), 200
+        if orjson is None:
+            return jsonify({'recommended_assessments': result}), 200
+        body = orjson.dumps({'recommended_assessments': result})
+        return Response(body, status=200, mimetype='application/json')
     
     except Exception:
         return jsonify({'error': 'Internal error'}), 500
 
 
+@app.route('/warmup', methods=['POST'])
+def warmup():
+    """Load the catalog ahead of traffic (scheduled warm-up workflow)"""
+    load_catalog()
+    return jsonify({'status': 'warm'}), 200
+
+
 @app.route('/api/info', methods=['GET'])
 def info():
     """API info"""
@@ -0,0 +1,33 @@
+"""
+Build the prebuilt keyword search index for the lightweight API
+Writes data/index.pickle (catalog columns + inverted index) so api/index.py
+can skip JSON parsing and tokenization on cold start
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api import index as api_index
+
+
+def main():
+    """Load scraped data, build the inverted index and save it"""
+    if not os.path.exists(api_index.get_data_path()):
+        print("Error: data/scraped_data.json not found. Run src/scraper.py first.")
+        return 1
+    
+    output_path = os.path.join('data', 'index.pickle')
+    count = api_index.save_index(output_path)
+    
+    if count == 0:
+        print("Error: No assessments loaded")
+        return 1
+    
+    print(f"✓ Saved search index for {count} assessments to {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
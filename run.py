@@ -5,10 +5,15 @@ This script runs all necessary steps in sequence
 
 import sys
 import os
+import argparse
 import logging
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Must run before any step imports numpy/torch/faiss
+from src.cpu_threads import configure_omp
+configure_omp()
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -72,7 +77,7 @@ def run_scraper():
     print(f"✓ Scraped and saved {len(assessments)} assessments")
 
 
-def generate_embeddings():
+def generate_embeddings(batch_size=64, num_workers=1):
     """Generate embeddings and build FAISS index"""
     print_header("Step 2: Generate Embeddings")
     
@@ -91,7 +96,7 @@ def generate_embeddings():
     
     # Generate
     manager.load_assessments()
-    manager.generate_embeddings()
+    manager.generate_embeddings(batch_size=batch_size, num_workers=num_workers)
     manager.build_faiss_index()
     manager.save_embeddings()
     
@@ -143,8 +148,8 @@ def generate_test_predictions():
         logger.warning("Could not load test queries. Skipping prediction generation.")
         return
     
-    df = generate_predictions(test_queries, output_file='predictions.csv', k=10)
-    print(f"✓ Generated {len(df)} predictions and saved to predictions.csv")
+    n_predictions = generate_predictions(test_queries, output_file='predictions.csv', k=10)
+    print(f"✓ Generated {n_predictions} predictions and saved to predictions.csv")
 
 
 def start_api():
@@ -161,12 +166,35 @@ def start_api():
     print("The web interface will be at: http://localhost:5000")
     print("\nPress Ctrl+C to stop the server\n")
     
+    import shutil
     import subprocess
-    subprocess.run([sys.executable, "api/app.py"])
+    
+    # Prefer gunicorn with threaded workers; fall back to Flask's dev
+    # server where gunicorn is unavailable (e.g. Windows)
+    if os.name != 'nt' and shutil.which("gunicorn"):
+        subprocess.run([
+            "gunicorn",
+            "--workers", "2",
+            "--worker-class", "gthread",
+            "--threads", "4",
+            "--bind", "0.0.0.0:5000",
+            "--timeout", "120",
+            "api.app:app"
+        ])
+    else:
+        logger.warning("gunicorn not available, using Flask development server")
+        subprocess.run([sys.executable, "api/app.py"])
 
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Run the complete SHL recommendation pipeline")
+    parser.add_argument('--batch-size', type=int, default=64,
+                        help="Texts per embedding batch (default: 64)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Embedding processes; >1 encodes in parallel (default: 1)")
+    args = parser.parse_args()
+    
     print_header("SHL Assessment Recommendation System - Complete Setup")
     
     print("This script will:")
@@ -186,7 +214,7 @@ def main():
         # Run all steps
         check_environment()
         run_scraper()
-        generate_embeddings()
+        generate_embeddings(batch_size=args.batch_size, num_workers=args.workers)
         test_recommender()
         generate_test_predictions()
         start_api()
@@ -200,7 +228,8 @@ def main():
     
     print_header("Setup Complete!")
     print("Your SHL Assessment Recommendation System is ready to use!")
-    print("\nTo restart the API later, run: python api/app.py")
+    print("\nTo restart the API later, run: gunicorn -w 2 -k gthread --threads 4 -b 0.0.0.0:5000 api.app:app")
+    print("  (or for development: python api/app.py)")
     print("To generate new predictions, run: python src/generate_predictions.py")
     
     return 0
@@ -5,6 +5,7 @@ Runs scraper, generates embeddings, and prepares the system
 
 import sys
 import os
+import argparse
 import logging
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,7 +17,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def setup():
+def setup(batch_size: int = 64, num_workers: int = 1):
     """Run full setup"""
     print(f"\n{'='*80}")
     print("SHL Assessment Recommendation System - Setup")
@@ -38,7 +39,7 @@ def setup():
     
     manager = EmbeddingManager()
     manager.load_assessments()
-    manager.generate_embeddings()
+    manager.generate_embeddings(batch_size=batch_size, num_workers=num_workers)
     manager.build_faiss_index()
     manager.save_embeddings()
     
@@ -68,4 +69,11 @@ def setup():
 
 
 if __name__ == "__main__":
-    setup()
+    parser = argparse.ArgumentParser(description="Set up the SHL recommendation system")
+    parser.add_argument('--batch-size', type=int, default=64,
+                        help="Texts per embedding batch (default: 64)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Embedding processes; >1 encodes in parallel (default: 1)")
+    args = parser.parse_args()
+    
+    setup(batch_size=args.batch_size, num_workers=args.workers)
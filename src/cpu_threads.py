@@ -0,0 +1,54 @@
+"""
+OpenMP thread budget for server worker processes
+Kept free of numpy/torch imports so entrypoints can call configure_omp()
+before any of them load and size their thread pools
+"""
+
+import os
+
+
+def cpu_count() -> int:
+    """Cores this process may run on (honours CPU affinity where available)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _parse_positive_int(value, default: int) -> int:
+    """
+    Parse an env value as a positive int, falling back to default
+    
+    OMP_NUM_THREADS may be a nested list such as "4,2"; the first entry is
+    the outer (per-process) thread count.
+    """
+    try:
+        parsed = int(str(value).split(',')[0].strip())
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed > 0 else default
+
+
+def default_threads() -> int:
+    """
+    Split the available cores between the server's worker processes
+    
+    WEB_CONCURRENCY is the worker count gunicorn reads by default, so W
+    workers don't run W x cores OpenMP threads.
+    """
+    workers = _parse_positive_int(os.environ.get('WEB_CONCURRENCY'), 1)
+    return max(1, cpu_count() // workers)
+
+
+def configure_omp() -> None:
+    """
+    Set OMP_NUM_THREADS unless the environment already does
+    
+    Must run before numpy/torch/faiss are first imported; their OpenMP
+    runtimes read the variable once, at load time.
+    """
+    os.environ.setdefault('OMP_NUM_THREADS', str(default_threads()))
+
+
+def omp_num_threads() -> int:
+    """Per-process OpenMP thread count from OMP_NUM_THREADS, parsed defensively"""
+    return _parse_positive_int(os.environ.get('OMP_NUM_THREADS'), default_threads())
@@ -3,37 +3,267 @@ Embedding generation and vector database management
 Uses sentence-transformers for embeddings and FAISS for vector search
 """
 
+import os
 import json
+import hashlib
+import math
+import re
 import numpy as np
 import pickle
-import os
+import time
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import List, Dict, Tuple
 from sentence_transformers import SentenceTransformer
-import faiss
+import torch
 import logging
 
+from src.cpu_threads import omp_num_threads
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+    logger.warning("FAISS not available, using NumPy brute-force search. Install with: pip install faiss-cpu")
+
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# HNSW graph parameters: neighbours per node, build-time and default search-time beam width
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+# Catalogs larger than this use an IVF index (nlist ~ sqrt(N)) instead of HNSW
+IVF_MIN_VECTORS = 20000
+IVF_NPROBE = 16
+
+# Index built when build_faiss_index is not given a type (e.g. 'sq8' for int8
+# codes at a quarter of the float32 memory); unset picks by catalog size
+FAISS_INDEX_TYPE = os.getenv('FAISS_INDEX_TYPE') or None
+
+# IVF-PQ shortlist size, as a multiple of k, rescored with exact inner products
+REFINE_K_FACTOR = 4
+
+# Distinct query strings whose embeddings are kept per EmbeddingManager
+QUERY_CACHE_SIZE = 1024
+
+
+# Loaded managers keyed by (model_name, embeddings_dir, quantize, backend,
+# mmap_index), so the model and index are read from disk once per process
+_INDEX_CACHE: Dict[tuple, 'EmbeddingManager'] = {}
+_INDEX_CACHE_LOCK = threading.Lock()  # guards the two dicts only, never a load
+
+# One lock per embeddings directory, held while a manager loads (or on a
+# cold start generates and saves) that directory's files
+_LOAD_LOCKS: Dict[str, threading.Lock] = {}
+
+
+def faiss_gpu_available() -> bool:
+    """True when a GPU build of FAISS (faiss-gpu) sees at least one device"""
+    return (FAISS_AVAILABLE and hasattr(faiss, 'StandardGpuResources')
+            and faiss.get_num_gpus() > 0)
+
+
+class OnnxEncoder:
+    """
+    ONNX Runtime replacement for SentenceTransformer.encode
+    
+    Exports the Hugging Face checkpoint with Optimum and reproduces the
+    sentence-transformers pipeline: tokenize, mean-pool over the attention
+    mask, optionally L2-normalize.
+    """
+    
+    def __init__(self, model_name: str, max_seq_length: int = 256):
+        if not ONNX_AVAILABLE:
+            raise ImportError("ONNX backend requires: pip install optimum[onnxruntime]")
+        
+        # Short names like 'all-MiniLM-L6-v2' live under the sentence-transformers org
+        if '/' not in model_name:
+            model_name = f'sentence-transformers/{model_name}'
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_name, export=True, provider='CPUExecutionProvider'
+        )
+        self.max_seq_length = max_seq_length
+    
+    def encode(self, texts: List[str], batch_size: int = 32,
+               normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        """
+        Encode texts into sentence embeddings
+        
+        Args:
+            texts: Texts to encode
+            batch_size: Texts per ONNX Runtime call
+            normalize_embeddings: L2-normalize each embedding
+            
+        Returns:
+            float32 matrix of shape (len(texts), dimension)
+        """
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors='np'
+            )
+            token_embeddings = self.model(**inputs).last_hidden_state
+            token_embeddings = np.asarray(token_embeddings, dtype=np.float32)
+            
+            # Mean pooling over real (non-padding) tokens
+            mask = inputs['attention_mask'][..., None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            batches.append(summed / np.clip(mask.sum(axis=1), 1e-9, None))
+        
+        embeddings = np.vstack(batches) if batches else np.empty((0, 0), dtype=np.float32)
+        if normalize_embeddings and len(embeddings):
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings
+
 
 class EmbeddingManager:
     """Manages embeddings and vector search for assessments"""
     
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+    # Keywords suggesting a query wants several test types, matched in one
+    # regex pass. Plain substrings, as before ('and' also matches 'understand').
+    _MULTI_RE = re.compile('|'.join(map(re.escape, [
+        'and', 'also', 'both', 'along with', 'as well as',
+        'good communication', 'soft skill', 'collaborate', 'team'
+    ])))
+    
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', half_precision: bool = True,
+                 quantize: bool = False, backend: str = 'pt', max_seq_length: int = 64,
+                 query_max_seq_length: int = 256):
         """
         Initialize embedding manager
         
         Args:
             model_name: Name of the sentence-transformer model to use
+            half_precision: Run the model in float16 when a GPU is available
+            quantize: Encode queries with a dynamically int8-quantized copy
+                of the model on CPU (backend 'pt'). Catalog embeddings are
+                always built with the fp32 model.
+            backend: Query encoder, 'pt' (PyTorch) or 'onnx' (ONNX Runtime).
+                generate_embeddings always uses the PyTorch model.
+            max_seq_length: Token limit for catalog texts, which are short;
+                attention cost grows with the square of it
+            query_max_seq_length: Token limit for queries, which can be job
+                descriptions of up to 2000 characters
         """
         self.model_name = model_name
-        self.model = SentenceTransformer(model_name)
+        self.quantize = quantize
+        self.backend = backend
+        
+        # Some environments default torch to a single intra-op thread. The
+        # entrypoints set OMP_NUM_THREADS before numpy loads (src.cpu_threads);
+        # torch and FAISS are sized explicitly here in case they did not
+        num_threads = omp_num_threads()
+        torch.set_num_threads(num_threads)
+        if FAISS_AVAILABLE:
+            faiss.omp_set_num_threads(num_threads)
+        
+        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.model = SentenceTransformer(model_name, device=self.device)
+        # The model keeps the query limit; _catalog_seq_length swaps in the
+        # catalog limit while generate_embeddings encodes
+        self.model.max_seq_length = query_max_seq_length
+        self.max_seq_length = max_seq_length
+        
+        # fp16 halves memory traffic on GPU; embeddings are cast back to
+        # float32 before they reach FAISS or NumPy search
+        self.precision = 'fp32'
+        if half_precision and self.device == 'cuda':
+            self.model.half()
+            self.precision = 'fp16'
+        
+        # Model used by encode_queries; generate_embeddings always uses self.model
+        if backend == 'onnx':
+            self.query_model = OnnxEncoder(model_name, self.model.max_seq_length)
+        elif backend == 'pt':
+            self.query_model = self.model
+            # Dynamic int8 quantization runs the Linear layers as int8 GEMMs
+            # on CPU. quantize_dynamic returns a copy, so the catalog is still
+            # encoded in fp32. Embedding layers need a different qconfig and
+            # are left as fp32.
+            if quantize and self.device == 'cpu':
+                self.query_model = torch.quantization.quantize_dynamic(
+                    self.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                logger.info("Applied dynamic int8 quantization to the query model")
+        else:
+            raise ValueError(f"Unknown embedding backend: {backend}")
+        
         self.assessments = []
         self.embeddings = None
         self.index = None
+        self.test_types_arr = None  # test_type per assessment, for vectorized diversity
+        self._gpu_res = None  # faiss GPU resources, kept alive with the GPU index
         self.dimension = 384  # Dimension for all-MiniLM-L6-v2
         
-        logger.info(f"Initialized embedding manager with model: {model_name}")
+        # Per-instance LRU, so cached embeddings never outlive the model that made them
+        self._encode_query_cached = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._encode_query_impl)
+        
+        logger.info(f"Initialized embedding manager with model: {model_name} on {self.device}")
+    
+    @classmethod
+    def get_cached(cls, model_name: str = 'all-MiniLM-L6-v2',
+                   embeddings_dir: str = 'data/embeddings',
+                   quantize: bool = False, backend: str = 'pt',
+                   mmap_index: bool = False) -> 'EmbeddingManager':
+        """
+        Return a process-wide manager with embeddings and index loaded
+        
+        The first call loads from embeddings_dir (generating and saving the
+        embeddings if they are missing); later calls reuse that instance.
+        
+        Args:
+            model_name: Name of the sentence-transformer model to use
+            embeddings_dir: Directory written by save_embeddings
+            quantize: Encode queries with an int8-quantized copy of the model on CPU
+            backend: Query encoder, 'pt' or 'onnx'
+            mmap_index: Memory-map the FAISS index file where supported
+            
+        Returns:
+            Shared EmbeddingManager instance
+        """
+        key = (model_name, embeddings_dir, quantize, backend, mmap_index)
+        with _INDEX_CACHE_LOCK:
+            manager = _INDEX_CACHE.get(key)
+            if manager is not None:
+                return manager
+            load_lock = _LOAD_LOCKS.setdefault(os.path.abspath(embeddings_dir), threading.Lock())
+        
+        # A cold start can take minutes; only callers of the same directory
+        # wait, and they then load the files it saved instead of rebuilding
+        with load_lock:
+            with _INDEX_CACHE_LOCK:
+                manager = _INDEX_CACHE.get(key)
+            if manager is not None:
+                return manager
+            
+            manager = cls(model_name, quantize=quantize, backend=backend)
+            if not manager.load_embeddings(embeddings_dir, mmap_index=mmap_index):
+                logger.warning("Failed to load embeddings. Generating new ones...")
+                manager.load_assessments()
+                manager.generate_embeddings()
+                manager.build_faiss_index()
+                manager.save_embeddings(embeddings_dir)
+            
+            with _INDEX_CACHE_LOCK:
+                _INDEX_CACHE[key] = manager
+            return manager
     
     def load_assessments(self, filepath: str = 'data/scraped_data.json') -> List[Dict]:
         """Load assessments from JSON file"""
@@ -46,10 +276,24 @@ class EmbeddingManager:
             logger.error(f"Error loading assessments: {e}")
             return []
     
-    def generate_embeddings(self) -> np.ndarray:
+    @staticmethod
+    def text_representation(assessment: Dict) -> str:
+        """Text embedded for an assessment: name, description, category and test type"""
+        text = f"{assessment['assessment_name']} {assessment.get('description', '')} "
+        text += f"{assessment.get('category', '')} {assessment.get('test_type', '')}"
+        return text.strip()
+    
+    def generate_embeddings(self, batch_size: int = 64, num_workers: int = 1,
+                            cache_path: str = 'data/embeddings/cache.npz') -> np.ndarray:
         """
         Generate embeddings for all assessments
         Combines assessment name, description, and category for rich representation
+        
+        Args:
+            batch_size: Number of texts encoded per model call
+            num_workers: Encoding processes; >1 uses a multi-process pool
+            cache_path: Content-hash keyed embedding cache; only texts not in
+                it are encoded. None disables the cache.
         """
         if not self.assessments:
             logger.error("No assessments loaded")
@@ -58,74 +302,377 @@ class EmbeddingManager:
         logger.info("Generating embeddings...")
         
         # Create text representations
-        texts = []
-        for assessment in self.assessments:
-            text = f"{assessment['assessment_name']} {assessment.get('description', '')} "
-            text += f"{assessment.get('category', '')} {assessment.get('test_type', '')}"
-            texts.append(text.strip())
-        
-        # Generate embeddings
-        self.embeddings = self.model.encode(
-            texts,
-            show_progress_bar=True,
-            convert_to_numpy=True,
-            normalize_embeddings=True
-        )
+        texts = [self.text_representation(assessment) for assessment in self.assessments]
+        
+        # Key on the settings that change catalog vectors as well as the
+        # text: the model, its sequence limit, its precision (fp16 on GPU
+        # halves self.model itself) and L2 normalization. The query encoder
+        # (int8 copy, ONNX) never touches the catalog, so it is left out.
+        prefix = f"{self.model_name}|{self.max_seq_length}|{self.precision}|l2|"
+        keys = [
+            hashlib.blake2b((prefix + text).encode('utf-8'), digest_size=16).hexdigest()
+            for text in texts
+        ]
+        cached = self._load_embedding_cache(cache_path) if cache_path else {}
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        logger.info(f"{len(texts) - len(missing)}/{len(texts)} embeddings found in cache")
+        
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for i, key in enumerate(keys):
+            if key in cached:
+                embeddings[i] = cached[key]
+        
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            self._log_token_lengths(missing_texts)
+            
+            # Generate embeddings
+            start = time.perf_counter()
+            embeddings[missing] = self._encode_texts(missing_texts, batch_size, num_workers)
+            elapsed = time.perf_counter() - start
+            logger.info(
+                f"Encoded {len(missing_texts)} texts "
+                f"in {elapsed:.2f}s ({len(missing_texts) / max(elapsed, 1e-9):.1f} texts/s, "
+                f"batch_size={batch_size}, workers={num_workers})"
+            )
+        
+        self.embeddings = embeddings
+        if cache_path and missing:
+            self._save_embedding_cache(cache_path, keys, embeddings)
         
         logger.info(f"Generated embeddings with shape: {self.embeddings.shape}")
         return self.embeddings
     
-    def build_faiss_index(self):
-        """Build FAISS index for fast similarity search"""
+    @contextmanager
+    def _catalog_seq_length(self):
+        """
+        Apply the catalog token limit to self.model for the duration
+        
+        Build-time only: while it is active, queries encoded through the
+        same model would be truncated too. get_cached finishes the build
+        before handing the manager to callers.
+        """
+        query_limit = self.model.max_seq_length
+        self.model.max_seq_length = self.max_seq_length
+        try:
+            yield
+        finally:
+            self.model.max_seq_length = query_limit
+    
+    def _encode_texts(self, texts: List[str], batch_size: int, num_workers: int) -> np.ndarray:
+        """Encode catalog texts with the PyTorch model into L2-normalized float32 rows"""
+        with self._catalog_seq_length():
+            if num_workers > 1:
+                pool = self.model.start_multi_process_pool(target_devices=['cpu'] * num_workers)
+                try:
+                    embeddings = self.model.encode_multi_process(texts, pool, batch_size=batch_size).astype(np.float32, copy=False)
+                finally:
+                    self.model.stop_multi_process_pool(pool)
+                # The multi-process encoder does not normalize
+                embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+                return embeddings
+            
+            return self._encode_on_device(self.model, texts, batch_size, show_progress_bar=True)
+    
+    def _encode_on_device(self, model, texts: List[str], batch_size: int,
+                          show_progress_bar: bool = False) -> np.ndarray:
+        """
+        Encode and L2-normalize on the model's device, then copy to host once
+        
+        convert_to_numpy would move every batch to the CPU and convert it
+        row by row; as a tensor the result stays on the device until the
+        single float32 copy at the end.
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        
+        embeddings = model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=show_progress_bar,
+            convert_to_tensor=True,
+            normalize_embeddings=True
+        )
+        return embeddings.to(torch.float32).cpu().numpy()
+    
+    @staticmethod
+    def _load_embedding_cache(cache_path: str) -> Dict[str, np.ndarray]:
+        """Read the content-hash embedding cache, or {} if missing/unreadable"""
+        if not os.path.exists(cache_path):
+            return {}
+        try:
+            with np.load(cache_path) as data:
+                return dict(zip(data['keys'].tolist(), data['embeddings']))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable embedding cache {cache_path}: {e}")
+            return {}
+    
+    @staticmethod
+    def _save_embedding_cache(cache_path: str, keys: List[str], embeddings: np.ndarray):
+        """Write the current catalog's embeddings (float16) keyed by content hash"""
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        np.savez(cache_path, keys=np.array(keys), embeddings=embeddings.astype(np.float16))
+        logger.info(f"Saved embedding cache to {cache_path}")
+    
+    def _log_token_lengths(self, texts: List[str]):
+        """Log the token-length distribution of catalog texts against max_seq_length"""
+        lengths = np.array([len(ids) for ids in self.model.tokenizer(texts)['input_ids']])
+        p99 = int(np.percentile(lengths, 99))
+        limit = self.max_seq_length
+        logger.info(f"Token lengths: median={int(np.median(lengths))}, p99={p99}, max_seq_length={limit}")
+        if p99 > limit:
+            logger.warning(
+                f"{int((lengths > limit).sum())}/{len(texts)} texts exceed max_seq_length={limit} "
+                f"and will be truncated"
+            )
+    
+    def build_faiss_index(self, index_type: str = None):
+        """
+        Build FAISS index for fast similarity search
+        
+        Args:
+            index_type: 'flat' (exact), 'sq8' (exact scan over int8 codes),
+                'hnsw' (graph), 'ivf' (inverted lists) or 'ivfpq'
+                (product-quantized inverted lists, rescored exactly).
+                Defaults to FAISS_INDEX_TYPE, else flat on GPU, ivf above
+                IVF_MIN_VECTORS and hnsw otherwise.
+        """
         if self.embeddings is None:
             logger.error("No embeddings available. Generate embeddings first.")
             return
         
-        logger.info("Building FAISS index...")
+        if not FAISS_AVAILABLE:
+            logger.info("FAISS not available, searches will use the embeddings matrix directly")
+            return
+        
+        # No copy when the embeddings are already contiguous float32 (the
+        # generate_embeddings case); converts a loaded float16 memmap once
+        vectors = np.ascontiguousarray(self.embeddings, dtype=np.float32)
+        
+        index_type = index_type or FAISS_INDEX_TYPE
+        if index_type is None:
+            if faiss_gpu_available():
+                # FAISS has no GPU HNSW; exact inner-product search on the GPU
+                # is faster than graph search on CPU at this catalog size
+                index_type = 'flat'
+            elif len(vectors) > IVF_MIN_VECTORS:
+                index_type = 'ivf'
+            else:
+                index_type = 'hnsw'
+        
+        logger.info(f"Building FAISS {index_type} index...")
         
-        # Use IndexFlatIP for inner product (cosine similarity with normalized vectors)
-        self.index = faiss.IndexFlatIP(self.dimension)
-        self.index.add(self.embeddings.astype('float32'))
+        # Inner product on normalized vectors is cosine similarity
+        if index_type == 'flat':
+            index = faiss.IndexFlatIP(self.dimension)
+        elif index_type == 'sq8':
+            # One byte per dimension with per-dimension ranges learned in train();
+            # queries stay float32 and are compared against the decoded codes
+            index = faiss.IndexScalarQuantizer(self.dimension, faiss.ScalarQuantizer.QT_8bit,
+                                               faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+        elif index_type == 'hnsw':
+            index = faiss.IndexHNSWFlat(self.dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        elif index_type in ('ivf', 'ivfpq'):
+            # Partition into ~sqrt(N) inverted lists; a search scans nprobe of them
+            nlist = int(math.sqrt(len(vectors)))
+            quantizer = faiss.IndexFlatIP(self.dimension)
+            if index_type == 'ivf':
+                index = faiss.IndexIVFFlat(quantizer, self.dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+            else:
+                # d/4 sub-quantizers of 8 bits: 4 bytes per 16 dims instead of 64
+                index = faiss.IndexIVFPQ(quantizer, self.dimension, nlist,
+                                         self.dimension // 4, 8, faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+            index.nprobe = IVF_NPROBE
+            if index_type == 'ivfpq':
+                # Two-stage search: PQ shortlist of k * REFINE_K_FACTOR, rescored exactly
+                index = faiss.IndexRefineFlat(index)
+                index.k_factor = REFINE_K_FACTOR
+        else:
+            raise ValueError(f"Unknown FAISS index type: {index_type}")
+        
+        index.add(vectors)
+        self.index = self._to_gpu(index)
+        
+        self.test_types_arr = None
+        self._test_types()
         
         logger.info(f"Built FAISS index with {self.index.ntotal} vectors")
     
-    def search(self, query: str, k: int = 10) -> List[Tuple[Dict, float]]:
+    def _to_gpu(self, index):
+        """Move a FAISS index to GPU 0, leaving types without a GPU version on CPU"""
+        if not faiss_gpu_available() or isinstance(index, (faiss.IndexHNSW, faiss.IndexRefine,
+                                                                 faiss.IndexScalarQuantizer)):
+            return index
+        
+        if self._gpu_res is None:
+            self._gpu_res = faiss.StandardGpuResources()
+        logger.info("Moving FAISS index to GPU")
+        return faiss.index_cpu_to_gpu(self._gpu_res, 0, index)
+    
+    def encode_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Encode queries into L2-normalized embeddings in one model call
+        
+        Args:
+            queries: Search queries
+            
+        Returns:
+            float32 matrix of shape (len(queries), dimension)
+        """
+        if isinstance(self.query_model, OnnxEncoder):
+            # ONNX Runtime already returns host NumPy arrays
+            query_embeddings = self.query_model.encode(
+                queries,
+                batch_size=32,
+                normalize_embeddings=True
+            )
+            return query_embeddings.astype(np.float32, copy=False)
+        return self._encode_on_device(self.query_model, queries, batch_size=32)
+    
+    def encode_query(self, query: str) -> np.ndarray:
+        """
+        Encode a query into an L2-normalized embedding
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            1-D float32 embedding
+        """
+        # Read-only view over the cached bytes
+        return np.frombuffer(self._encode_query_cached(query), dtype=np.float32)
+    
+    def _encode_query_impl(self, query: str) -> bytes:
+        """Uncached encode_query; returns bytes so the LRU holds immutable values"""
+        return self.encode_queries([query])[0].tobytes()
+    
+    def search(self, query: str, k: int = 10,
+               query_embedding: np.ndarray = None,
+               ef_search: int = None, nprobe: int = None) -> List[Tuple[int, float]]:
         """
         Search for most relevant assessments
         
         Args:
             query: Search query
             k: Number of results to return
+            query_embedding: Precomputed query embedding (encoded if omitted)
+            ef_search: HNSW search depth; higher trades latency for recall
+            nprobe: IVF lists scanned; higher trades latency for recall
             
         Returns:
-            List of (assessment, score) tuples
+            List of (assessment index, score) tuples; see hydrate()
+        """
+        if query_embedding is None:
+            query_embedding = self.encode_query(query)
+        query_embedding = query_embedding.reshape(1, -1)
+        return self.search_batch([query], k, query_embeddings=query_embedding,
+                                 ef_search=ef_search, nprobe=nprobe)[0]
+    
+    def search_batch(self, queries: List[str], k: int = 10,
+                     query_embeddings: np.ndarray = None,
+                     ef_search: int = None, nprobe: int = None) -> List[List[Tuple[int, float]]]:
         """
-        if self.index is None:
+        Search for several queries with one encode and one index search
+        
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+            query_embeddings: Precomputed (len(queries), d) embeddings
+            ef_search: HNSW search depth; higher trades latency for recall
+            nprobe: IVF lists scanned; higher trades latency for recall
+            
+        Returns:
+            One list of (assessment index, score) tuples per query
+        """
+        scores, indices = self._search_arrays(queries, k, query_embeddings, ef_search, nprobe)
+        
+        n_assessments = len(self.assessments)
+        return [
+            [
+                (int(idx), float(score))
+                for idx, score in zip(row_indices, row_scores)
+                if 0 <= idx < n_assessments
+            ]
+            for row_indices, row_scores in zip(indices, scores)
+        ]
+    
+    def hydrate(self, idx: int) -> Dict:
+        """
+        Assessment dict for an index returned by search
+        
+        The dict is shared with the catalog; copy it before modifying.
+        """
+        return self.assessments[idx]
+    
+    def _search_arrays(self, queries: List[str], k: int,
+                       query_embeddings: np.ndarray = None,
+                       ef_search: int = None, nprobe: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run the index search
+        
+        Returns:
+            (scores, indices) arrays of shape (len(queries), k); FAISS pads
+            missing neighbours with index -1
+        """
+        if self.index is None and self.embeddings is None:
             logger.error("FAISS index not built")
-            return []
+            return np.empty((len(queries), 0), dtype=np.float32), np.empty((len(queries), 0), dtype=np.int64)
         
-        # Generate query embedding
-        query_embedding = self.model.encode(
-            [query],
-            convert_to_numpy=True,
-            normalize_embeddings=True
-        )
+        # Generate query embeddings
+        if query_embeddings is None:
+            query_embeddings = self.encode_queries(queries)
         
         # Search
-        scores, indices = self.index.search(query_embedding.astype('float32'), k)
+        if self.index is not None:
+            params = None
+            if isinstance(self.index, faiss.IndexHNSW):
+                # efSearch below k would return fewer than k neighbours
+                params = faiss.SearchParametersHNSW(efSearch=max(ef_search or HNSW_EF_SEARCH, k))
+            elif isinstance(self.index, faiss.IndexIVF) and nprobe is not None:
+                params = faiss.SearchParametersIVF(nprobe=nprobe)
+            elif isinstance(self.index, faiss.IndexRefine) and nprobe is not None:
+                params = faiss.IndexRefineSearchParameters(
+                    k_factor=self.index.k_factor,
+                    base_index_params=faiss.SearchParametersIVF(nprobe=nprobe))
+            return self.index.search(np.ascontiguousarray(query_embeddings, dtype=np.float32), k, params=params)
+        return self.vector_search(query_embeddings, k)
+    
+    @staticmethod
+    def _with_score(assessment: Dict, score: float) -> Tuple[Dict, float]:
+        """Copy an assessment and attach its relevance score"""
+        return {**assessment, 'relevance_score': score}, score
+    
+    def vector_search(self, query_embeddings: np.ndarray, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Brute-force cosine search over the normalized embeddings matrix
         
-        # Prepare results
-        results = []
-        for idx, score in zip(indices[0], scores[0]):
-            if idx < len(self.assessments):
-                assessment = self.assessments[idx].copy()
-                assessment['relevance_score'] = float(score)
-                results.append((assessment, float(score)))
+        Args:
+            query_embeddings: L2-normalized embedding (d,) or matrix (M, d)
+            k: Number of results to return per query
+            
+        Returns:
+            (scores, indices) arrays of shape (M, k), best match first
+        """
+        queries = np.atleast_2d(query_embeddings)
+        sims = queries.astype(np.float32, copy=False) @ self.embeddings.T
+        k = max(0, min(k, sims.shape[1]))
+        if k == 0:
+            # argpartition has no kth for an empty selection (k <= 0 or an empty catalog)
+            return np.empty((len(queries), 0), dtype=np.float32), np.empty((len(queries), 0), dtype=np.int64)
         
-        return results
+        # argpartition selects the top k in O(N); only those k get sorted
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        
+        return np.take_along_axis(top_scores, order, axis=1), np.take_along_axis(top, order, axis=1)
     
     def search_with_diversity(self, query: str, k: int = 10, 
-                            diversity_weight: float = 0.3) -> List[Tuple[Dict, float]]:
+                            diversity_weight: float = 0.3,
+                            query_embedding: np.ndarray = None) -> List[Tuple[Dict, float]]:
         """
         Search with diversity to ensure balanced test types
         
@@ -133,83 +680,118 @@ class EmbeddingManager:
             query: Search query
             k: Number of results to return
             diversity_weight: Weight for diversity (0-1)
+            query_embedding: Precomputed query embedding (encoded if omitted)
             
         Returns:
             List of (assessment, score) tuples with diverse test types
         """
-        # Get more candidates than needed
-        candidates = self.search(query, k * 3)
+        if query_embedding is None:
+            query_embedding = self.encode_query(query)
+        query_embedding = query_embedding.reshape(1, -1)
+        return self.search_with_diversity_batch([query], k, query_embeddings=query_embedding)[0]
+    
+    def search_with_diversity_batch(self, queries: List[str], k: int = 10,
+                                    query_embeddings: np.ndarray = None) -> List[List[Tuple[Dict, float]]]:
+        """
+        Diversity-aware search for several queries with one index search
         
-        if not candidates:
-            return []
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+            query_embeddings: Precomputed (len(queries), d) embeddings
+            
+        Returns:
+            One list of (assessment, score) tuples per query
+        """
+        # Get more candidates than needed; only the k picked per query are copied
+        scores, indices = self._search_arrays(queries, k * 3, query_embeddings)
+        results = []
+        for query, row_indices, row_scores in zip(queries, indices, scores):
+            picked_indices, picked_scores = self.diversify(query, row_indices, row_scores, k)
+            results.append([
+                self._with_score(self.assessments[idx], float(score))
+                for idx, score in zip(picked_indices, picked_scores)
+            ])
+        return results
+    
+    def _test_types(self) -> np.ndarray:
+        """Test type of each assessment as an array aligned with self.assessments"""
+        if self.test_types_arr is None or len(self.test_types_arr) != len(self.assessments):
+            self.test_types_arr = np.array(
+                [str(a.get('test_type', 'O')) for a in self.assessments]
+            )
+        return self.test_types_arr
+    
+    def diversify(self, query: str, indices: np.ndarray, scores: np.ndarray,
+                  k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pick k candidates, balancing test types when the query asks for it
         
-        # Group by test type
-        by_type = {}
-        for assessment, score in candidates:
-            test_type = assessment.get('test_type', 'O')
-            if test_type not in by_type:
-                by_type[test_type] = []
-            by_type[test_type].append((assessment, score))
+        Args:
+            query: Search query
+            indices: Candidate assessment indices sorted by score
+            scores: Scores aligned with indices
+            k: Number of results to return
+            
+        Returns:
+            (indices, scores) arrays of the picked candidates, best first
+        """
+        # Drop FAISS padding (-1) and anything outside the catalog
+        valid = (indices >= 0) & (indices < len(self.assessments))
+        indices = indices[valid]
+        scores = scores[valid]
+        if indices.size == 0:
+            return indices, scores
         
-        # Determine if query requires multiple types
-        query_lower = query.lower()
-        requires_multiple = any(word in query_lower for word in [
-            'and', 'also', 'both', 'along with', 'as well as',
-            'good communication', 'soft skill', 'collaborate', 'team'
-        ])
+        cand_types = self._test_types()[indices]
         
-        # Select results
-        results = []
+        # Types in order of their best-scoring candidate
+        types, first_seen = np.unique(cand_types, return_index=True)
+        types = types[np.argsort(first_seen)].tolist()
         
-        if requires_multiple and len(by_type) > 1:
-            # Balanced selection from different types
-            types_to_include = []
-            
-            # Prioritize K and P types for technical + soft skill queries
-            if 'K' in by_type:
-                types_to_include.append('K')
-            if 'P' in by_type:
-                types_to_include.append('P')
-            if 'C' in by_type and len(types_to_include) < 2:
-                types_to_include.append('C')
-            if 'S' in by_type and len(types_to_include) < 2:
-                types_to_include.append('S')
-            
-            # Add remaining types if needed
-            for test_type in by_type:
-                if test_type not in types_to_include:
-                    types_to_include.append(test_type)
-            
-            # Distribute k results across types
-            per_type = k // max(len(types_to_include), 1)
-            remainder = k % max(len(types_to_include), 1)
-            
-            for i, test_type in enumerate(types_to_include):
-                count = per_type + (1 if i < remainder else 0)
-                results.extend(by_type[test_type][:count])
-            
-            # Sort by score and take top k
-            results.sort(key=lambda x: x[1], reverse=True)
-            results = results[:k]
-        else:
+        # Determine if query requires multiple types
+        requires_multiple = self._MULTI_RE.search(query.lower()) is not None
+        
+        if not (requires_multiple and len(types) > 1):
             # Simple top-k by score
-            results = candidates[:k]
+            return indices[:k], scores[:k]
         
-        return results
+        # Prioritize K and P types for technical + soft skill queries,
+        # then C/S to make up two, then the remaining types
+        types_to_include = [t for t in ('K', 'P') if t in types]
+        for test_type in ('C', 'S'):
+            if test_type in types and len(types_to_include) < 2:
+                types_to_include.append(test_type)
+        types_to_include += [t for t in types if t not in types_to_include]
+        
+        # Distribute k results across types
+        per_type, remainder = divmod(k, len(types_to_include))
+        picks = np.concatenate([
+            np.flatnonzero(cand_types == test_type)[:per_type + (1 if i < remainder else 0)]
+            for i, test_type in enumerate(types_to_include)
+        ])
+        
+        # Sort by score (stable, so ties keep type order) and take top k
+        picks = picks[np.argsort(-scores[picks], kind='stable')][:k]
+        return indices[picks], scores[picks]
     
     def save_embeddings(self, embeddings_dir: str = 'data/embeddings'):
         """Save embeddings and index to disk"""
         os.makedirs(embeddings_dir, exist_ok=True)
         
-        # Save embeddings
+        # Save embeddings as float16: normalized vectors lose nothing
+        # measurable for inner-product ranking, and the file is half the size
         embeddings_path = os.path.join(embeddings_dir, 'embeddings.npy')
-        np.save(embeddings_path, self.embeddings)
+        np.save(embeddings_path, self.embeddings.astype(np.float16))
         logger.info(f"Saved embeddings to {embeddings_path}")
         
         # Save FAISS index
-        index_path = os.path.join(embeddings_dir, 'faiss.index')
-        faiss.write_index(self.index, index_path)
-        logger.info(f"Saved FAISS index to {index_path}")
+        if self.index is not None:
+            index_path = os.path.join(embeddings_dir, 'faiss.index')
+            # GPU indexes do not serialize; write a CPU copy
+            index = faiss.index_gpu_to_cpu(self.index) if self._gpu_res is not None else self.index
+            faiss.write_index(index, index_path)
+            logger.info(f"Saved FAISS index to {index_path}")
         
         # Save assessments with metadata
         metadata_path = os.path.join(embeddings_dir, 'metadata.pkl')
@@ -221,18 +803,32 @@ class EmbeddingManager:
             }, f)
         logger.info(f"Saved metadata to {metadata_path}")
     
-    def load_embeddings(self, embeddings_dir: str = 'data/embeddings'):
-        """Load embeddings and index from disk"""
+    def load_embeddings(self, embeddings_dir: str = 'data/embeddings', mmap_index: bool = False):
+        """
+        Load embeddings and index from disk
+        
+        Args:
+            embeddings_dir: Directory written by save_embeddings
+            mmap_index: Memory-map the FAISS index so forked workers share the
+                OS page cache instead of each holding a copy. FAISS honours
+                this for IVF inverted lists; other index types load normally.
+        """
         try:
-            # Load embeddings
+            # Load embeddings, memory-mapped and read-only: pages are read on demand
             embeddings_path = os.path.join(embeddings_dir, 'embeddings.npy')
-            self.embeddings = np.load(embeddings_path)
-            logger.info(f"Loaded embeddings from {embeddings_path}")
+            self.embeddings = np.load(embeddings_path, mmap_mode='r')
+            logger.info(f"Memory-mapped embeddings from {embeddings_path}")
             
             # Load FAISS index
-            index_path = os.path.join(embeddings_dir, 'faiss.index')
-            self.index = faiss.read_index(index_path)
-            logger.info(f"Loaded FAISS index from {index_path}")
+            if FAISS_AVAILABLE:
+                index_path = os.path.join(embeddings_dir, 'faiss.index')
+                io_flags = (faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY) if mmap_index else 0
+                self.index = self._to_gpu(faiss.read_index(index_path, io_flags))
+                logger.info(f"Loaded FAISS index from {index_path}")
+            else:
+                # No index holds the vectors, so NumPy search reads this matrix
+                # on every query: materialize it as float32 (stored as float16)
+                self.embeddings = np.asarray(self.embeddings, dtype=np.float32)
             
             # Load assessments
             metadata_path = os.path.join(embeddings_dir, 'metadata.pkl')
@@ -241,6 +837,8 @@ class EmbeddingManager:
                 self.assessments = metadata['assessments']
                 self.model_name = metadata['model_name']
                 self.dimension = metadata['dimension']
+            self.test_types_arr = None
+            self._test_types()
             logger.info(f"Loaded {len(self.assessments)} assessments from metadata")
             
             return True
@@ -30,19 +30,47 @@ class RecommendationEvaluator:
         Returns:
             Recall@K score (0 to 1)
         """
-        if not relevant:
+        return self._recall(predicted, frozenset(relevant), len(relevant), k)
+    
+    @staticmethod
+    def _recall(predicted: List[str], relevant_set: frozenset, n_relevant: int, k: int) -> float:
+        """Recall@K against a prebuilt set of relevant URLs"""
+        if not n_relevant:
             return 0.0
         
-        # Take top k predictions
-        predicted_k = predicted[:k]
-        
-        # Count how many relevant items are in top k
-        hits = len(set(predicted_k) & set(relevant))
+        # Count distinct relevant items in the top k predictions
+        hits = len(relevant_set.intersection(predicted[:k]))
         
         # Recall = hits / total relevant
-        recall = hits / len(relevant)
+        return hits / n_relevant
+    
+    def per_query_recall_at_k(self, predictions: Dict[str, List[str]],
+                              ground_truth: Dict[str, List[str]], k: int = 10) -> Dict[str, float]:
+        """
+        Calculate Recall@K for every ground-truth query that has predictions
+        
+        Args:
+            predictions: Dict mapping query to list of predicted URLs
+            ground_truth: Dict mapping query to list of relevant URLs
+            k: Number of top predictions to consider
+            
+        Returns:
+            Dict mapping query to Recall@K
+        """
+        # Build each relevant set once instead of per comparison
+        gt_sets = {query: frozenset(urls) for query, urls in ground_truth.items()}
+        gt_lens = {query: len(urls) for query, urls in ground_truth.items()}
         
-        return recall
+        recalls = {}
+        for query, relevant_set in gt_sets.items():
+            if query not in predictions:
+                continue
+            recall = self._recall(predictions[query], relevant_set, gt_lens[query], k)
+            recalls[query] = recall
+            
+            logger.debug(f"Query: {query[:50]}... | Recall@{k}: {recall:.3f}")
+        
+        return recalls
     
     def mean_recall_at_k(self, predictions: Dict[str, List[str]], 
                         ground_truth: Dict[str, List[str]], k: int = 10) -> float:
@@ -57,23 +85,14 @@ class RecommendationEvaluator:
         Returns:
             Mean Recall@K score (0 to 1)
         """
-        recalls = []
+        recalls = self.per_query_recall_at_k(predictions, ground_truth, k)
         
+        # Queries without predictions count as zero recall
         for query in ground_truth:
-            if query not in predictions:
+            if query not in recalls:
                 logger.warning(f"Query not in predictions: {query}")
-                recalls.append(0.0)
-                continue
-            
-            predicted = predictions[query]
-            relevant = ground_truth[query]
-            
-            recall = self.recall_at_k(predicted, relevant, k)
-            recalls.append(recall)
-            
-            logger.debug(f"Query: {query[:50]}... | Recall@{k}: {recall:.3f}")
         
-        mean_recall = np.mean(recalls) if recalls else 0.0
+        mean_recall = sum(recalls.values()) / len(ground_truth) if ground_truth else 0.0
         return mean_recall
     
     def evaluate_diversity(self, predictions: Dict[str, List[Dict]]) -> Dict[str, float]:
@@ -116,30 +135,23 @@ class RecommendationEvaluator:
         Returns:
             Dict with evaluation metrics
         """
+        # Only the two needed columns; queries repeat per row, so store them
+        # as categoricals (smaller, and faster to group)
+        read_kwargs = {'usecols': ['query', 'assessment_url'], 'dtype': {'query': 'category'}}
+        
         # Load predictions
-        pred_df = pd.read_csv(predictions_csv)
+        pred_df = pd.read_csv(predictions_csv, **read_kwargs)
         
         # Load ground truth
-        gt_df = pd.read_csv(ground_truth_csv)
+        gt_df = pd.read_csv(ground_truth_csv, **read_kwargs)
         
         # Group by query
-        predictions = {}
-        for query, group in pred_df.groupby('query'):
-            predictions[query] = group['assessment_url'].tolist()
-        
-        ground_truth = {}
-        for query, group in gt_df.groupby('query'):
-            ground_truth[query] = group['assessment_url'].tolist()
+        predictions = pred_df.groupby('query', observed=True)['assessment_url'].agg(list).to_dict()
+        ground_truth = gt_df.groupby('query', observed=True)['assessment_url'].agg(list).to_dict()
         
         # Calculate metrics
         mean_recall = self.mean_recall_at_k(predictions, ground_truth, k)
-        
-        # Per-query recall
-        per_query_recalls = {}
-        for query in ground_truth:
-            if query in predictions:
-                recall = self.recall_at_k(predictions[query], ground_truth[query], k)
-                per_query_recalls[query] = recall
+        per_query_recalls = self.per_query_recall_at_k(predictions, ground_truth, k)
         
         results = {
             'mean_recall_at_k': mean_recall,
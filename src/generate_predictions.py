@@ -5,11 +5,17 @@ Outputs predictions in the required CSV format
 
 import sys
 import os
-import pandas as pd
-import logging
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Must run before pandas pulls in numpy
+from src.cpu_threads import configure_omp
+configure_omp()
+
+import csv
+import pandas as pd
+import logging
+
 from src.recommender import RAGRecommender
 from src.evaluator import RecommendationEvaluator
 
@@ -17,47 +23,58 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def generate_predictions(test_queries, output_file='predictions.csv', k=10):
+def generate_predictions(test_queries, output_file='predictions.csv', k=10, batch_size=32):
     """
     Generate predictions for test queries
     
+    Rows are written to the CSV as each batch of queries is answered,
+    so predictions are never held in memory all at once.
+    
     Args:
         test_queries: List of test queries
         output_file: Output CSV file path
         k: Number of recommendations per query
+        batch_size: Queries embedded and searched per batch
+        
+    Returns:
+        Number of prediction rows written
     """
     logger.info(f"Generating predictions for {len(test_queries)} test queries...")
     
     # Initialize recommender
     recommender = RAGRecommender()
     
-    # Generate predictions
-    all_predictions = []
+    test_queries = list(test_queries)
+    n_predictions = 0
     
-    for i, query in enumerate(test_queries, 1):
-        logger.info(f"Processing query {i}/{len(test_queries)}: {query[:60]}...")
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['query', 'assessment_url'])
+        writer.writeheader()
         
-        try:
-            recommendations = recommender.recommend(query, k=k)
+        # Generate predictions: each batch of queries is embedded and searched together
+        for start in range(0, len(test_queries), batch_size):
+            batch = test_queries[start:start + batch_size]
             
-            for rec in recommendations:
-                all_predictions.append({
-                    'query': query,
-                    'assessment_url': rec['url']
-                })
-        
-        except Exception as e:
-            logger.error(f"Error processing query: {e}")
-            continue
-    
-    # Create DataFrame
-    df = pd.DataFrame(all_predictions)
+            try:
+                batch_recommendations = recommender.recommend_batch(batch, k=k)
+            except Exception as e:
+                # Skip the failed batch, as the per-query loop skipped failed queries
+                logger.error(f"Error processing queries {start + 1}-{start + len(batch)}: {e}")
+                continue
+            
+            for i, (query, recommendations) in enumerate(zip(batch, batch_recommendations), start + 1):
+                logger.info(f"Processed query {i}/{len(test_queries)}: {query[:60]}...")
+                
+                for rec in recommendations:
+                    writer.writerow({
+                        'query': query,
+                        'assessment_url': rec['url']
+                    })
+                n_predictions += len(recommendations)
     
-    # Save to CSV
-    df.to_csv(output_file, index=False)
-    logger.info(f"Saved {len(all_predictions)} predictions to {output_file}")
+    logger.info(f"Saved {n_predictions} predictions to {output_file}")
     
-    return df
+    return n_predictions
 
 
 def main():
@@ -73,17 +90,17 @@ def main():
     logger.info(f"Loaded {len(test_queries)} test queries")
     
     # Generate predictions
-    df = generate_predictions(test_queries, output_file='predictions.csv', k=10)
+    n_predictions = generate_predictions(test_queries, output_file='predictions.csv', k=10)
     
     # Print summary
     print(f"\n{'='*80}")
     print("Prediction Generation Complete!")
     print(f"{'='*80}")
     print(f"Total queries: {len(test_queries)}")
-    print(f"Total predictions: {len(df)}")
+    print(f"Total predictions: {n_predictions}")
     print(f"\nOutput file: predictions.csv")
     print(f"\nSample predictions:")
-    print(df.head(10))
+    print(pd.read_csv('predictions.csv', nrows=10))
     print(f"\n{'='*80}")
 
 
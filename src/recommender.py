@@ -3,8 +3,14 @@ RAG-based recommendation engine using LangChain and Google Gemini
 """
 
 import os
-from typing import List, Dict
+import re
+import asyncio
+import threading
+from functools import cached_property
+from typing import List, Dict, Optional
+from urllib.parse import urlsplit
 import logging
+import numpy as np
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -13,45 +19,110 @@ load_dotenv()
 try:
     import google.generativeai as genai
     from langchain_google_genai import ChatGoogleGenerativeAI
-    from langchain.prompts import PromptTemplate
-    from langchain.chains import LLMChain
     GEMINI_AVAILABLE = True
 except ImportError:
     GEMINI_AVAILABLE = False
     logging.warning("Google Gemini not available. Install with: pip install google-generativeai langchain-google-genai")
 
 from src.embeddings import EmbeddingManager
+from src.rerank_parser import parse_rerank, rank_stream, arank_stream
+from src.semantic_cache import SemanticCache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Characters of each assessment description included in rerank prompts
+PROMPT_DESCRIPTION_LENGTH = 200
+
+# Queries shorter than this (after stripping) return no recommendations
+MIN_QUERY_LENGTH = 3
+
+# Queries reranked per batched Gemini prompt; keeps the prompt well inside the context window
+LLM_BATCH_SIZE = 6
+
+# One "Result [i]:" block per sample in a batched rerank response
+_RESULT_BLOCK_RE = re.compile(r"Result \[(\d+)\]:(.*?)(?=Result \[|\Z)", re.S)
+
+
+# Event loop that runs sync callers' batched reranks (see _rerank_loop)
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+
+
+def _rerank_loop() -> asyncio.AbstractEventLoop:
+    """
+    Process-wide event loop, run forever in a daemon thread
+    
+    The async Gemini client (gRPC aio) binds to the first loop it runs on,
+    so batched reranks must always use the same loop; a fresh asyncio.run
+    loop per call would leave later calls "attached to a different loop".
+    Recreated after a fork, since the loop's thread does not survive it.
+    """
+    global _loop, _loop_pid
+    
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='rerank-loop', daemon=True).start()
+            _loop, _loop_pid = loop, os.getpid()
+        return _loop
+
+
+class RerankError(Exception):
+    """
+    LLM rerank failed; carries the vector-order fallback recommendations
+    
+    Raised only when the caller asks for it, so results that would be
+    degraded can be served without being cached.
+    """
+    
+    def __init__(self, recommendations: List[Dict]):
+        super().__init__("LLM rerank failed; vector-order fallback attached")
+        self.recommendations = recommendations
+
+
+def _normalize_url(url: str) -> str:
+    """Lookup key for a URL: lowercase scheme and host, no fragment or trailing slash"""
+    parts = urlsplit(url.strip())
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}{parts.path.rstrip('/')}{query}"
+
 
 class RAGRecommender:
     """RAG-based Assessment Recommender using Gemini LLM"""
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, skip_llm_min_score: float = 0.85,
+                 skip_llm_min_margin: float = 0.15,
+                 semantic_cache: Optional[SemanticCache] = None):
         """
         Initialize RAG recommender
         
         Args:
             api_key: Google Gemini API key (or uses GOOGLE_API_KEY env var)
+            skip_llm_min_score: Top vector score above which results may skip the LLM
+            skip_llm_min_margin: Required gap between the top and k-th score to skip the LLM
+            semantic_cache: Cache of final recommendations keyed by query
+                embedding; pass the caller's cache to share one layer
         """
         self.api_key = api_key or os.getenv('GOOGLE_API_KEY')
         
-        # Initialize embedding manager
-        self.embedding_manager = EmbeddingManager()
+        # Decisive vector rankings are returned without an LLM rerank
+        self.skip_llm_min_score = skip_llm_min_score
+        self.skip_llm_min_margin = skip_llm_min_margin
+        self.llm_skips = 0
+        self.llm_reranks = 0
+        self._gate_lock = threading.Lock()  # one recommender serves many threads
+        
+        # The embedding manager (model, embeddings, index) loads lazily on
+        # first use; see the embedding_manager property
         
-        # Load embeddings and index
-        if not self.embedding_manager.load_embeddings():
-            logger.warning("Failed to load embeddings. Generating new ones...")
-            self.embedding_manager.load_assessments()
-            self.embedding_manager.generate_embeddings()
-            self.embedding_manager.build_faiss_index()
-            self.embedding_manager.save_embeddings()
+        # Near-duplicate queries are answered from here without a search or
+        # LLM call; the API injects its cache so there is only one layer
+        self.semantic_cache = semantic_cache if semantic_cache is not None else SemanticCache()
         
         # Initialize LLM if API key is available
         self.llm = None
-        self.chain = None
         
         if GEMINI_AVAILABLE and self.api_key:
             try:
@@ -59,17 +130,49 @@ class RAGRecommender:
                     model="gemini-pro",
                     google_api_key=self.api_key,
                     temperature=0.2,
-                    convert_system_message_to_human=True
+                    convert_system_message_to_human=True,
+                    # gRPC multiplexes concurrent calls over one long-lived
+                    # HTTP/2 channel instead of a TLS connection per request
+                    transport=os.getenv('GEMINI_TRANSPORT', 'grpc')
                 )
-                self._setup_chain()
+                self._setup_prompt()
                 logger.info("Initialized Gemini LLM for RAG")
             except Exception as e:
                 logger.warning(f"Failed to initialize Gemini: {e}")
         else:
             logger.warning("Gemini not available. Using embeddings-only mode.")
     
-    def _setup_chain(self):
-        """Setup LangChain prompt and chain"""
+    @cached_property
+    def embedding_manager(self) -> EmbeddingManager:
+        """
+        Shared embedding manager with embeddings and index loaded
+        
+        Loaded on first access rather than in the constructor, so creating a
+        recommender is cheap; the process-wide EmbeddingManager.get_cached
+        means every recommender (and thread) shares one model and index.
+        Uses the int8 model on CPU for query encoding; EMBEDDING_BACKEND=onnx
+        switches query encoding to ONNX Runtime.
+        """
+        return EmbeddingManager.get_cached(
+            quantize=True,
+            backend=os.getenv('EMBEDDING_BACKEND', 'pt'),
+            mmap_index=True
+        )
+    
+    @cached_property
+    def _by_url(self) -> Dict[str, Dict]:
+        """O(1) lookup by normalized URL; the first entry wins if a URL repeats"""
+        by_url = {}
+        for assessment in self.embedding_manager.assessments:
+            by_url.setdefault(_normalize_url(assessment['url']), assessment)
+        return by_url
+    
+    async def _ensure_ready(self):
+        """Load the embedding manager in a worker thread so the event loop is not blocked"""
+        await asyncio.to_thread(lambda: self.embedding_manager)
+    
+    def _setup_prompt(self):
+        """Setup the rerank prompt template"""
         template = """You are an expert HR assessment consultant specializing in SHL assessments.
 
 Given a job requirement or query, analyze what skills and competencies are needed and recommend the most relevant assessments.
@@ -90,14 +193,24 @@ Provide your recommendations as a numbered list with brief justification for eac
 
 Recommendations:"""
 
-        prompt = PromptTemplate(
-            input_variables=["query", "retrieved_assessments"],
-            template=template
-        )
+        # Rerank hot path: plain str.format, streamed straight to self.llm
+        self._prompt_fmt = template.format
+    
+    def embed(self, query: str) -> np.ndarray:
+        """
+        Compute the normalized embedding of a query
         
-        self.chain = LLMChain(llm=self.llm, prompt=prompt)
+        Args:
+            query: User query or job description
+            
+        Returns:
+            1-D float32 query embedding
+        """
+        return self.embedding_manager.encode_query(query)
     
-    def recommend(self, query: str, k: int = 10, use_llm: bool = True) -> List[Dict]:
+    def recommend(self, query: str, k: int = 10, use_llm: bool = True,
+                  query_embedding: np.ndarray = None,
+                  raise_rerank_errors: bool = False) -> List[Dict]:
         """
         Generate assessment recommendations
         
@@ -105,47 +218,379 @@ Recommendations:"""
             query: User query or job description
             k: Number of recommendations (max 10)
             use_llm: Whether to use LLM for reranking (if available)
+            query_embedding: Precomputed query embedding from embed()
+            raise_rerank_errors: Raise RerankError instead of silently
+                returning the vector-order fallback when the rerank fails
             
         Returns:
             List of recommended assessments
         """
-        k = min(k, 10)  # Cap at 10 as per requirements
-        k = max(k, 5)   # Minimum 5 as per requirements
+        if len(query.strip()) < MIN_QUERY_LENGTH:
+            logger.info("Query too short, skipping search")
+            return []
+        
+        k = max(1, min(k, 10))  # Cap at 10 as per requirements; the API enforces its minimum of 5
         
         logger.info(f"Generating recommendations for query: {query[:50]}...")
         
+        # The embedding keys the semantic cache, so compute it up front
+        if query_embedding is None:
+            query_embedding = self.embed(query)
+        
+        if use_llm:
+            cached = self._cache_lookup(query_embedding, k)
+            if cached is not None:
+                return self._rank(cached, k)
+        
         # Step 1: Retrieve candidates using vector search
-        candidates = self.embedding_manager.search_with_diversity(query, k=k)
+        candidates = self.embedding_manager.search_with_diversity(
+            query, k=k, query_embedding=query_embedding
+        )
+        
+        return self._finalize(query, candidates, k, use_llm, query_embedding, raise_rerank_errors)
+    
+    def recommend_batch(self, queries: List[str], k: int = 10, use_llm: bool = True,
+                        return_rerank_errors: bool = False) -> List[List[Dict]]:
+        """
+        Generate recommendations for several queries at once
+        
+        All queries are embedded in one model call and searched with one
+        index search. LLM reranks run concurrently via abatch_recommend on
+        the process-wide rerank loop, so this also works from a thread that
+        already runs an event loop (it blocks that loop while waiting, so
+        async callers should await abatch_recommend instead).
+        
+        Args:
+            queries: User queries or job descriptions
+            k: Number of recommendations per query (max 10)
+            use_llm: Whether to use LLM for reranking (if available)
+            return_rerank_errors: Put a RerankError (carrying the fallback) in
+                place of each query whose LLM rerank failed
+            
+        Returns:
+            One list of recommended assessments per query
+        """
+        if not queries:
+            return []
+        
+        keep = self._searchable(queries)
+        if len(keep) < len(queries):
+            results = [[] for _ in queries]
+            batch = self.recommend_batch([queries[i] for i in keep], k=k, use_llm=use_llm,
+                                         return_rerank_errors=return_rerank_errors)
+            for i, recommendations in zip(keep, batch):
+                results[i] = recommendations
+            return results
+        
+        k = max(1, min(k, 10))  # Cap at 10 as per requirements; the API enforces its minimum of 5
+        
+        # LLM reranks are network-bound; run them concurrently on the one
+        # long-lived loop the async Gemini client is bound to
+        if use_llm and self.llm:
+            future = asyncio.run_coroutine_threadsafe(
+                self.abatch_recommend(queries, k=k, use_llm=use_llm,
+                                      return_rerank_errors=return_rerank_errors),
+                _rerank_loop()
+            )
+            return future.result()
+        
+        logger.info(f"Generating recommendations for {len(queries)} queries...")
+        
+        query_embeddings = self.embedding_manager.encode_queries(queries)
+        results, pending = self._batch_cache_lookup(query_embeddings, k, use_llm)
+        if not pending:
+            return results
+        
+        all_candidates = self.embedding_manager.search_with_diversity_batch(
+            [queries[i] for i in pending], k=k, query_embeddings=query_embeddings[pending]
+        )
+        for i, candidates in zip(pending, all_candidates):
+            try:
+                results[i] = self._finalize(queries[i], candidates, k, use_llm, query_embeddings[i],
+                                            raise_rerank_errors=return_rerank_errors)
+            except RerankError as e:
+                results[i] = e
+        return results
+    
+    async def arecommend(self, query: str, k: int = 10, use_llm: bool = True) -> List[Dict]:
+        """
+        Async variant of recommend; the LLM rerank does not block the event loop
+        
+        Args:
+            query: User query or job description
+            k: Number of recommendations (max 10)
+            use_llm: Whether to use LLM for reranking (if available)
+            
+        Returns:
+            List of recommended assessments
+        """
+        if len(query.strip()) < MIN_QUERY_LENGTH:
+            logger.info("Query too short, skipping search")
+            return []
+        
+        k = max(1, min(k, 10))  # Cap at 10 as per requirements; the API enforces its minimum of 5
+        
+        await self._ensure_ready()
+        query_embedding = await asyncio.to_thread(self.embed, query)
+        
+        if use_llm:
+            cached = self._cache_lookup(query_embedding, k)
+            if cached is not None:
+                return self._rank(cached, k)
+        
+        candidates = await asyncio.to_thread(
+            self.embedding_manager.search_with_diversity, query, k=k,
+            query_embedding=query_embedding
+        )
+        return await self._afinalize(query, candidates, k, use_llm, query_embedding)
+    
+    async def abatch_recommend(self, queries: List[str], k: int = 10, use_llm: bool = True,
+                               return_rerank_errors: bool = False) -> List[List[Dict]]:
+        """
+        Generate recommendations for several queries with concurrent LLM reranks
+        
+        The queries are searched in one batch (in a worker thread), then
+        reranked LLM_BATCH_SIZE queries per Gemini prompt, with all prompts
+        issued together via asyncio.gather: about one round-trip and N/B
+        prompt overheads instead of N of each.
+        
+        Args:
+            queries: User queries or job descriptions
+            k: Number of recommendations per query (max 10)
+            use_llm: Whether to use LLM for reranking (if available)
+            return_rerank_errors: Put a RerankError (carrying the fallback) in
+                place of each query whose LLM rerank failed
+            
+        Returns:
+            One list of recommended assessments per query
+        """
+        if not queries:
+            return []
+        
+        keep = self._searchable(queries)
+        if len(keep) < len(queries):
+            results = [[] for _ in queries]
+            batch = await self.abatch_recommend([queries[i] for i in keep], k=k, use_llm=use_llm,
+                                                return_rerank_errors=return_rerank_errors)
+            for i, recommendations in zip(keep, batch):
+                results[i] = recommendations
+            return results
+        
+        k = max(1, min(k, 10))  # Cap at 10 as per requirements; the API enforces its minimum of 5
+        
+        logger.info(f"Generating recommendations for {len(queries)} queries (async)...")
         
+        await self._ensure_ready()
+        query_embeddings = await asyncio.to_thread(self.embedding_manager.encode_queries, queries)
+        results, pending = self._batch_cache_lookup(query_embeddings, k, use_llm)
+        if not pending:
+            return results
+        
+        searched = await asyncio.to_thread(
+            self.embedding_manager.search_with_diversity_batch,
+            [queries[i] for i in pending], k=k, query_embeddings=query_embeddings[pending]
+        )
+        all_candidates = dict(zip(pending, searched))
+        
+        if not (use_llm and self.llm):
+            for i in pending:
+                results[i] = self._finalize(queries[i], all_candidates[i], k, use_llm, query_embeddings[i])
+            return results
+        
+        # Decisive vector rankings are served as-is; only the rest go to the LLM
+        positions = []
+        for i in pending:
+            candidates = all_candidates[i]
+            if not candidates:
+                logger.warning(f"No candidates found for query: {queries[i][:50]}...")
+                continue
+            if self._is_decisive(candidates, k):
+                recommendations = [assessment for assessment, score in candidates[:k]]
+                self._cache_insert(query_embeddings[i], k, recommendations)
+                results[i] = self._rank(recommendations, k)
+            else:
+                positions.append(i)
+        
+        groups = [positions[start:start + LLM_BATCH_SIZE] for start in range(0, len(positions), LLM_BATCH_SIZE)]
+        reranked = await asyncio.gather(*[
+            self._allm_rerank_batch([(queries[i], all_candidates[i]) for i in group], k)
+            for group in groups
+        ], return_exceptions=True)
+        
+        for group, group_recommendations in zip(groups, reranked):
+            if isinstance(group_recommendations, Exception):
+                logger.error(f"Error in batched LLM reranking: {group_recommendations}")
+                for i in group:
+                    fallback = self._rank([assessment for assessment, score in all_candidates[i][:k]], k)
+                    results[i] = RerankError(fallback) if return_rerank_errors else fallback
+                continue
+            
+            for i, recommendations in zip(group, group_recommendations):
+                self._cache_insert(query_embeddings[i], k, recommendations)
+                results[i] = self._rank(recommendations, k)
+        return results
+    
+    def _finalize(self, query: str, candidates: List[tuple], k: int, use_llm: bool,
+                  query_embedding: np.ndarray = None, raise_rerank_errors: bool = False) -> List[Dict]:
+        """
+        Rerank retrieved candidates and attach ranks
+        
+        Args:
+            query: User query
+            candidates: List of (assessment, score) tuples
+            k: Number of results to return
+            use_llm: Whether to use LLM for reranking (if available)
+            query_embedding: Query embedding; the result is cached under it
+            raise_rerank_errors: Raise RerankError with the fallback on a failed rerank
+            
+        Returns:
+            List of recommended assessments
+        """
         if not candidates:
             logger.warning("No candidates found")
             return []
         
         # Step 2: Use LLM for reranking and refinement (if available)
-        if use_llm and self.llm and self.chain:
+        if use_llm and self.llm and not self._is_decisive(candidates, k):
             try:
                 recommendations = self._llm_rerank(query, candidates, k)
             except Exception as e:
                 logger.error(f"LLM reranking failed: {e}")
-                recommendations = [assessment for assessment, score in candidates[:k]]
+                # Not cached, so the next near-duplicate retries the rerank
+                fallback = self._rank([assessment for assessment, score in candidates[:k]], k)
+                if raise_rerank_errors:
+                    raise RerankError(fallback) from e
+                return fallback
         else:
             # Fallback: use vector search results directly
             recommendations = [assessment for assessment, score in candidates[:k]]
         
-        # Ensure we have between 5-10 results
-        recommendations = recommendations[:k]
+        if use_llm:
+            self._cache_insert(query_embedding, k, recommendations)
+        return self._rank(recommendations, k)
+    
+    async def _afinalize(self, query: str, candidates: List[tuple], k: int, use_llm: bool,
+                         query_embedding: np.ndarray = None) -> List[Dict]:
+        """Async variant of _finalize using the non-blocking LLM rerank"""
+        if not candidates:
+            logger.warning("No candidates found")
+            return []
+        
+        if use_llm and self.llm and not self._is_decisive(candidates, k):
+            try:
+                recommendations = await self._allm_rerank(query, candidates, k)
+            except Exception as e:
+                logger.error(f"LLM reranking failed: {e}")
+                return self._rank([assessment for assessment, score in candidates[:k]], k)
+        else:
+            recommendations = [assessment for assessment, score in candidates[:k]]
+        
+        if use_llm:
+            self._cache_insert(query_embedding, k, recommendations)
+        return self._rank(recommendations, k)
+    
+    def _cache_lookup(self, query_embedding: np.ndarray, k: int) -> Optional[List[Dict]]:
+        """
+        Cached recommendations for a near-duplicate query, or None
+        
+        Returns fresh copies so ranking them does not touch the cache.
+        """
+        cached = self.semantic_cache.lookup(query_embedding, k)
+        if cached is None:
+            return None
+        logger.info("Serving recommendations from semantic cache")
+        return [dict(assessment) for assessment in cached]
+    
+    def _cache_insert(self, query_embedding: np.ndarray, k: int, recommendations: List[Dict]):
+        """Remember final recommendations for later near-duplicate queries"""
+        if query_embedding is not None:
+            self.semantic_cache.insert(
+                query_embedding, k, tuple(dict(assessment) for assessment in recommendations)
+            )
+    
+    def _batch_cache_lookup(self, query_embeddings: np.ndarray, k: int, use_llm: bool) -> tuple:
+        """
+        Serve what the semantic cache can for a batch of queries
+        
+        Returns:
+            (results, pending): ranked results with cache hits filled in, and
+            the indices of the queries that still need a search
+        """
+        results = [[] for _ in range(len(query_embeddings))]
+        if not use_llm:
+            return results, list(range(len(query_embeddings)))
+        
+        pending = []
+        for i, query_embedding in enumerate(query_embeddings):
+            cached = self._cache_lookup(query_embedding, k)
+            if cached is not None:
+                results[i] = self._rank(cached, k)
+            else:
+                pending.append(i)
+        return results, pending
+    
+    @staticmethod
+    def _searchable(queries: List[str]) -> List[int]:
+        """Indices of the queries long enough to search; the rest get no results"""
+        return [i for i, query in enumerate(queries) if len(query.strip()) >= MIN_QUERY_LENGTH]
+    
+    def _is_decisive(self, candidates: List[tuple], k: int) -> bool:
+        """
+        Whether the vector ranking is clear enough to skip the LLM rerank
         
-        # Add ranking
-        for i, rec in enumerate(recommendations, 1):
-            rec['rank'] = i
+        True when the top score is high and well separated from the k-th.
+        Counts skips and reranks so the gate's hit rate can be monitored.
+        """
+        top = candidates[0][1]
+        kth = candidates[min(k, len(candidates)) - 1][1]
+        decisive = top > self.skip_llm_min_score and top - kth > self.skip_llm_min_margin
+        
+        with self._gate_lock:
+            if decisive:
+                self.llm_skips += 1
+            else:
+                self.llm_reranks += 1
+            skips, total = self.llm_skips, self.llm_skips + self.llm_reranks
+        
+        logger.debug(f"LLM rerank gate: skipped {skips}/{total} ({skips / total:.1%})")
+        if decisive:
+            logger.debug(f"Vector scores decisive (top={top:.3f}, k-th={kth:.3f}); skipping LLM rerank")
+        return decisive
+    
+    def rerank_gate_stats(self) -> Dict[str, int]:
+        """Consistent snapshot of the LLM rerank gate counters"""
+        with self._gate_lock:
+            return {'skipped': self.llm_skips, 'reranked': self.llm_reranks}
+    
+    @staticmethod
+    def _rank(recommendations: List[Dict], k: int) -> List[Dict]:
+        """Trim to k and attach 1-based ranks to shallow copies"""
+        # Copies, so ranks never leak into cached results or the dicts
+        # other callers were handed
+        recommendations = [{**rec, 'rank': i} for i, rec in enumerate(recommendations[:k], 1)]
         
         logger.info(f"Generated {len(recommendations)} recommendations")
         return recommendations
     
+    @staticmethod
+    def _format_candidates(candidates: List[tuple]) -> str:
+        """Format retrieved candidates for the rerank prompt"""
+        # Descriptions are truncated to keep the prompt (and Gemini latency) small
+        return "".join([
+            f"{i}. {assessment['assessment_name']}\n"
+            f"   Description: {str(assessment.get('description', 'N/A'))[:PROMPT_DESCRIPTION_LENGTH]}\n"
+            f"   Type: {assessment.get('test_type', 'N/A')}\n"
+            f"   Relevance Score: {score:.3f}\n\n"
+            for i, (assessment, score) in enumerate(candidates, 1)
+        ])
+    
     def _llm_rerank(self, query: str, candidates: List[tuple], k: int) -> List[Dict]:
         """
         Use LLM to rerank and refine recommendations
         
+        The response is streamed and its ranked list matched as it arrives;
+        the stream is closed as soon as k list items have named candidates.
+        
         Args:
             query: User query
             candidates: List of (assessment, score) tuples
@@ -155,40 +600,71 @@ Recommendations:"""
             Reranked list of assessments
         """
         # Format candidates for LLM
-        retrieved_text = ""
-        for i, (assessment, score) in enumerate(candidates, 1):
-            retrieved_text += f"{i}. {assessment['assessment_name']}\n"
-            retrieved_text += f"   Description: {assessment.get('description', 'N/A')}\n"
-            retrieved_text += f"   Type: {assessment.get('test_type', 'N/A')}\n"
-            retrieved_text += f"   Relevance Score: {score:.3f}\n\n"
-        
-        # Run LLM chain
-        try:
-            response = self.chain.run(
-                query=query,
-                retrieved_assessments=retrieved_text
-            )
-            
-            # Parse LLM response to extract recommended assessments
-            # The LLM should maintain the order of relevance
-            recommended = []
-            
-            # Try to match assessment names from response
-            for assessment, score in candidates:
-                name = assessment['assessment_name']
-                if name in response:
-                    recommended.append(assessment)
-            
-            # If parsing fails, fall back to original order
-            if len(recommended) < k:
-                logger.warning("LLM parsing incomplete, using original ranking")
-                recommended = [assessment for assessment, score in candidates[:k]]
+        retrieved_text = self._format_candidates(candidates)
+        
+        prompt_text = self._prompt_fmt(query=query, retrieved_assessments=retrieved_text)
+        
+        # Run LLM; errors propagate to the caller, which falls back to vector order
+        return rank_stream(self.llm.stream(prompt_text), candidates, k)
+    
+    async def _allm_rerank(self, query: str, candidates: List[tuple], k: int) -> List[Dict]:
+        """
+        Async variant of _llm_rerank using the LLM's astream
+        
+        Args:
+            query: User query
+            candidates: List of (assessment, score) tuples
+            k: Number of results to return
             
-            return recommended[:k]
+        Returns:
+            Reranked list of assessments
+        """
+        retrieved_text = self._format_candidates(candidates)
+        prompt_text = self._prompt_fmt(query=query, retrieved_assessments=retrieved_text)
+        
+        return await arank_stream(self.llm.astream(prompt_text), candidates, k)
+    
+    def _batch_prompt(self, items: List[tuple], k: int) -> str:
+        """Build one rerank prompt covering several (query, candidates) samples"""
+        samples = "\n".join(
+            f"Sample [{i}]:\nQUERY={query}\nCANDIDATES:\n{self._format_candidates(candidates)}"
+            for i, (query, candidates) in enumerate(items, 1)
+        )
+        return f"""You are an expert HR assessment consultant specializing in SHL assessments.
+
+For each sample below, analyze what skills and competencies the query needs and select the top {k} most relevant assessments from that sample's candidates, with a balanced mix if the query requires multiple skill types (e.g., technical + communication).
+
+{samples}
+Return for each sample a numbered list of the top-{k} assessment names, ranked by relevance, under the header 'Result [i]:' where i is the sample number.
+"""
+    
+    def _parse_batch_response(self, response: str, items: List[tuple], k: int) -> List[List[Dict]]:
+        """Split a batched response into per-sample blocks and parse each"""
+        blocks = {int(num): text for num, text in _RESULT_BLOCK_RE.findall(response)}
+        # A missing block parses as empty and falls back to the vector ranking
+        return [
+            parse_rerank(blocks.get(i, ''), candidates, k)
+            for i, (query, candidates) in enumerate(items, 1)
+        ]
+    
+    def _llm_rerank_batch(self, items: List[tuple], k: int) -> List[List[Dict]]:
+        """
+        Rerank several queries with a single LLM call
+        
+        Args:
+            items: (query, candidates) pairs, at most LLM_BATCH_SIZE
+            k: Number of results to return per query
             
-        except Exception as e:
-            logger.error(f"Error in LLM reranking: {e}")
-            return [assessment for assessment, score in candidates[:k]]
+        Returns:
+            One reranked list of assessments per item
+        """
+        response = self.llm.invoke(self._batch_prompt(items, k)).content
+        return self._parse_batch_response(response, items, k)
+    
+    async def _allm_rerank_batch(self, items: List[tuple], k: int) -> List[List[Dict]]:
+        """Async variant of _llm_rerank_batch"""
+        message = await self.llm.ainvoke(self._batch_prompt(items, k))
+        return self._parse_batch_response(message.content, items, k)
     
     def recommend_from_jd_text(self, jd_text: str, k: int = 10) -> List[Dict]:
         """
@@ -230,10 +706,7 @@ List the main technical skills, soft skills, and any other relevant requirements
         Returns:
             Assessment details dict
         """
-        for assessment in self.embedding_manager.assessments:
-            if assessment['url'] == assessment_url:
-                return assessment
-        return None
+        return self._by_url.get(_normalize_url(assessment_url))
 
 
 def main():
@@ -263,12 +736,16 @@ def main():
     print("Testing RAG Recommender")
     print(f"{'='*80}\n")
     
-    for query in test_queries:
+    # The queries are independent; overlap their LLM round trips
+    async def recommend_all():
+        return await asyncio.gather(*(recommender.arecommend(query, k=10) for query in test_queries))
+    
+    all_recommendations = asyncio.run(recommend_all())
+    
+    for query, recommendations in zip(test_queries, all_recommendations):
         print(f"Query: {query}")
         print("-" * 80)
         
-        recommendations = recommender.recommend(query, k=10)
-        
         print(f"\nTop {len(recommendations)} Recommendations:\n")
         for rec in recommendations:
             print(f"{rec['rank']}. {rec['assessment_name']}")
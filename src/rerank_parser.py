@@ -0,0 +1,235 @@
+"""
+Parse LLM rerank responses back into candidate assessments
+Works on streamed responses so a rerank can stop once k items are ranked
+"""
+
+import re
+import logging
+from typing import List, Dict
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Start of a ranked-list item: "1.", "2)", "**3.**", "- ", "* ", "• "
+_LIST_ITEM_RE = re.compile(r"(\s*)[*_]{0,2}\s*(?:(\d+)\s*[.):]|[-*•](?=\s))")
+
+
+class MentionMatcher:
+    """
+    Incrementally map a rerank response to candidates, one list item at a time
+    
+    Each item of the response's ranked list contributes the candidate it
+    names first, so justification text naming other assessments does not
+    count as a ranking. Only complete lines are scanned, each exactly once.
+    The list style (numbered or bulleted) and indent are fixed by the
+    first item, so nested bullets under a numbered item are ignored. A
+    response with no list at all is ranked by first mention instead.
+    """
+    
+    def __init__(self, candidates: List[tuple]):
+        """
+        Args:
+            candidates: List of (assessment, score) tuples
+        """
+        self.candidates = candidates
+        self.picked = []  # candidate indices in ranked-list order
+        self._picked_set = set()
+        self._chunks = []  # full response, for the no-list fallback
+        self._pending = ""  # trailing partial line
+        self._list_kind = None  # (numbered, indent) of the first list item
+        self._open_item = False  # last list item has not named a candidate yet
+        self._finished = False
+        self.automaton = None
+        self._names = []  # (candidate index, name) for the str.find path
+        
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for i, (assessment, score) in enumerate(candidates):
+                name = assessment['assessment_name']
+                if name in automaton:
+                    automaton.get(name)[1].append(i)  # duplicate names share a key
+                elif name:
+                    automaton.add_word(name, (len(name), [i]))
+            
+            if len(automaton):
+                automaton.make_automaton()
+                self.automaton = automaton
+        else:
+            self._names = [
+                (i, assessment['assessment_name'])
+                for i, (assessment, score) in enumerate(candidates)
+                if assessment['assessment_name']
+            ]
+    
+    def feed(self, chunk: str) -> int:
+        """
+        Append a chunk of response text and rank any newly completed lines
+        
+        Args:
+            chunk: Next piece of the response
+            
+        Returns:
+            Number of list items matched to candidates so far
+        """
+        self._chunks.append(chunk)
+        *lines, self._pending = (self._pending + chunk).split('\n')
+        for line in lines:
+            self._scan_line(line)
+        return len(self.picked)
+    
+    def finish(self) -> int:
+        """
+        Rank the final line, which has no trailing newline
+        
+        Returns:
+            Number of list items matched to candidates
+        """
+        if not self._finished:
+            self._finished = True
+            self._scan_line(self._pending)
+            self._pending = ""
+        return len(self.picked)
+    
+    def ranked(self, k: int) -> List[Dict]:
+        """
+        Candidates in the order the response's ranked list names them
+        
+        Args:
+            k: Number of results to return
+            
+        Returns:
+            Reranked list of assessments
+        """
+        self.finish()
+        
+        picked = self.picked
+        if self._list_kind is None:
+            picked = self._first_mentions(''.join(self._chunks))
+        recommended = [self.candidates[i][0] for i in picked]
+        
+        # If parsing fails, fall back to original order
+        if len(recommended) < k:
+            logger.warning("LLM parsing incomplete, using original ranking")
+            recommended = [assessment for assessment, score in self.candidates[:k]]
+        
+        return recommended[:k]
+    
+    def _scan_line(self, line: str):
+        """Attribute one complete line to the ranked list"""
+        item = _LIST_ITEM_RE.match(line)
+        if item is not None:
+            kind = (item.group(2) is not None, len(item.group(1).expandtabs()))
+            if self._list_kind is None:
+                self._list_kind = kind
+            if kind[0] == self._list_kind[0] and kind[1] <= self._list_kind[1]:
+                self._open_item = True
+                line = line[item.end():]
+        
+        # Text between items only counts while the current item has named no
+        # candidate yet (e.g. "1." on its own line, the name on the next)
+        if not self._open_item:
+            return
+        
+        i = self._first_candidate(line)
+        if i is not None:
+            self._open_item = False
+            if i not in self._picked_set:
+                self._picked_set.add(i)
+                self.picked.append(i)
+    
+    def _matches(self, text: str):
+        """Yield (start, length, candidate indices) for every name mention in text"""
+        if self.automaton is not None:
+            for end, (length, ids) in self.automaton.iter(text):
+                yield end - length + 1, length, ids
+        else:
+            for i, name in self._names:
+                position = text.find(name)
+                if position >= 0:
+                    yield position, len(name), [i]
+    
+    def _first_candidate(self, line: str):
+        """
+        Candidate named earliest in a line, or None
+        
+        A name inside a longer one (e.g. "Java 8" in "Java 8 (New)") loses
+        to the longer name at the same position; remaining ties keep the
+        vector-search order. Of candidates sharing a name, the first not
+        yet ranked is returned.
+        """
+        best = None
+        for start, length, ids in self._matches(line):
+            i = next((i for i in ids if i not in self._picked_set), ids[0])
+            key = (start, -length, i)
+            if best is None or key < best:
+                best = key
+        return None if best is None else best[2]
+    
+    def _first_mentions(self, text: str) -> List[int]:
+        """Candidate indices ordered by first mention anywhere in text"""
+        first_seen = {}
+        for start, length, ids in self._matches(text):
+            for i in ids:
+                if start < first_seen.get(i, start + 1):
+                    first_seen[i] = start
+        # Ties (e.g. a name inside another) keep the vector-search order
+        return sorted(first_seen, key=lambda i: (first_seen[i], i))
+
+
+def rank_stream(stream, candidates: List[tuple], k: int) -> List[Dict]:
+    """
+    Rank candidates from a streamed LLM response, stopping at k list items
+    
+    The stream is closed as soon as k candidates are ranked, so the rest
+    of the response (usually justification text) is never generated.
+    
+    Args:
+        stream: Iterator of message chunks with a `content` attribute
+        candidates: List of (assessment, score) tuples
+        k: Number of results to return
+        
+    Returns:
+        Reranked list of assessments
+    """
+    matcher = MentionMatcher(candidates)
+    try:
+        for chunk in stream:
+            if matcher.feed(chunk.content) >= k:
+                break
+    finally:
+        stream.close()
+    return matcher.ranked(k)
+
+
+async def arank_stream(stream, candidates: List[tuple], k: int) -> List[Dict]:
+    """Async variant of rank_stream for an async iterator of message chunks"""
+    matcher = MentionMatcher(candidates)
+    try:
+        async for chunk in stream:
+            if matcher.feed(chunk.content) >= k:
+                break
+    finally:
+        await stream.aclose()
+    return matcher.ranked(k)
+
+
+def parse_rerank(response: str, candidates: List[tuple], k: int) -> List[Dict]:
+    """
+    Map a complete LLM rerank response back to candidate assessments
+    
+    Args:
+        response: LLM response text
+        candidates: List of (assessment, score) tuples
+        k: Number of results to return
+        
+    Returns:
+        Reranked list of assessments
+    """
+    matcher = MentionMatcher(candidates)
+    matcher.feed(response)
+    return matcher.ranked(k)
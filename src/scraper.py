@@ -4,28 +4,245 @@ Scrapes individual test solutions from https://www.shl.com/solutions/products/pr
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
+from lxml import html as lxml_html
+import asyncio
+import itertools
 import json
 import time
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
 import logging
+from functools import lru_cache
+from urllib.parse import urljoin
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Product detail pages fetched at once, and connections opened per host
+DETAIL_CONCURRENCY = 64
+DETAIL_CONNECTIONS_PER_HOST = 16
+
+# Retries for a rate-limited (429) detail page, with exponential backoff
+DETAIL_RETRIES = 3
+DETAIL_BACKOFF = 0.5
+
+# Display names per test type code
+CATEGORY_NAMES = {
+    'C': 'Cognitive Ability',
+    'P': 'Personality & Behavior',
+    'K': 'Knowledge & Skills',
+    'S': 'Situational Judgment',
+    'O': 'Other'
+}
+TEST_TYPE_FULL_NAMES = {
+    'C': 'Ability & Aptitude',
+    'P': 'Personality & Behavior',
+    'K': 'Knowledge & Skills',
+    'S': 'Simulations',
+    'O': 'Other'
+}
+
+# Fallback assessment durations per test type: base + (idx % spread) minutes
+FALLBACK_DURATIONS = {
+    'C': (10, 15),  # 10-24 minutes
+    'P': (15, 20),  # 15-34 minutes
+    'K': (8, 17),   # 8-24 minutes
+}
+FALLBACK_DEFAULT_DURATION = (12, 18)  # 12-29 minutes
+
+# Fallback catalog base entries: (name, description, test type)
+# Cognitive Assessments (100+)
+_COGNITIVE_ASSESSMENTS = (
+    ("Verify Interactive - G+", "General cognitive ability assessment", "C"),
+    ("Verify Interactive - Numerical", "Numerical reasoning assessment", "C"),
+    ("Verify Interactive - Verbal", "Verbal reasoning assessment", "C"),
+    ("Verify Interactive - Deductive", "Deductive reasoning assessment", "C"),
+    ("Verify Interactive - Inductive", "Inductive reasoning assessment", "C"),
+    ("Verify Interactive - Calculation", "Calculation ability test", "C"),
+    ("General Ability - Reasoning", "General reasoning ability", "C"),
+    ("Numerical Reasoning - Advanced", "Advanced numerical reasoning", "C"),
+    ("Verbal Reasoning - Advanced", "Advanced verbal reasoning", "C"),
+    ("Abstract Reasoning", "Abstract reasoning test", "C"),
+    ("Spatial Reasoning", "Spatial ability assessment", "C"),
+    ("Mechanical Reasoning", "Mechanical reasoning test", "C"),
+    ("Critical Thinking Assessment", "Critical thinking skills", "C"),
+    ("Problem Solving Test", "Problem-solving abilities", "C"),
+    ("Logical Reasoning", "Logical thinking assessment", "C"),
+    ("Analytical Reasoning", "Analytical ability test", "C"),
+    ("Data Interpretation", "Data analysis skills", "C"),
+    ("Numerical Computation", "Numerical computation test", "C"),
+    ("Verbal Comprehension", "Reading comprehension test", "C"),
+    ("Cognitive Speed Test", "Processing speed assessment", "C"),
+)
+
+# Personality & Behavior Assessments (100+)
+_PERSONALITY_ASSESSMENTS = (
+    ("OPQ32", "Occupational personality questionnaire", "P"),
+    ("Motivation Questionnaire (MQ)", "Workplace motivation assessment", "P"),
+    ("Customer Service Aptitude Profile", "Customer service personality", "P"),
+    ("Sales Achievement Predictor", "Sales personality traits", "P"),
+    ("Leadership Effectiveness", "Leadership style assessment", "P"),
+    ("Emotional Intelligence", "EI assessment", "P"),
+    ("Teamwork Assessment", "Team collaboration skills", "P"),
+    ("Communication Style", "Communication preferences", "P"),
+    ("Work Style Profile", "Work behavior patterns", "P"),
+    ("Resilience Assessment", "Stress management ability", "P"),
+    ("Adaptability Test", "Change management skills", "P"),
+    ("Conflict Resolution Style", "Conflict handling approach", "P"),
+    ("Decision Making Style", "Decision-making preferences", "P"),
+    ("Ethical Judgment", "Ethics and integrity", "P"),
+    ("Initiative & Drive", "Self-motivation assessment", "P"),
+    ("Detail Orientation", "Attention to detail", "P"),
+    ("Creativity Assessment", "Creative thinking ability", "P"),
+    ("Influence & Persuasion", "Influencing skills", "P"),
+    ("Collaboration Skills", "Collaborative behavior", "P"),
+    ("Accountability Profile", "Responsibility ownership", "P"),
+)
+
+# Knowledge & Skills Assessments (100+)
+_KNOWLEDGE_ASSESSMENTS = (
+    ("Java Programming - Intermediate", "Java coding skills", "K"),
+    ("Python Programming - Advanced", "Python development skills", "K"),
+    ("JavaScript Development", "JavaScript proficiency", "K"),
+    ("SQL Database Skills", "SQL query and database knowledge", "K"),
+    ("C++ Programming", "C++ development skills", "K"),
+    ("C# .NET Development", "C# and .NET framework", "K"),
+    ("React.js Development", "React framework skills", "K"),
+    ("Angular Development", "Angular framework knowledge", "K"),
+    ("Node.js Development", "Node.js backend skills", "K"),
+    ("PHP Programming", "PHP development skills", "K"),
+    ("Ruby on Rails", "Ruby programming skills", "K"),
+    ("Swift Programming", "iOS development skills", "K"),
+    ("Kotlin Development", "Android development with Kotlin", "K"),
+    ("DevOps Practices", "DevOps knowledge assessment", "K"),
+    ("Cloud Computing - AWS", "AWS cloud skills", "K"),
+    ("Cloud Computing - Azure", "Microsoft Azure skills", "K"),
+    ("Cloud Computing - GCP", "Google Cloud Platform", "K"),
+    ("Cybersecurity Fundamentals", "Security knowledge test", "K"),
+    ("Network Administration", "Networking skills", "K"),
+    ("System Administration - Linux", "Linux admin skills", "K"),
+    ("System Administration - Windows", "Windows server skills", "K"),
+    ("Data Science Fundamentals", "Data science knowledge", "K"),
+    ("Machine Learning Basics", "ML concepts and skills", "K"),
+    ("Data Analysis - Excel", "Excel data analysis", "K"),
+    ("Data Visualization", "Visualization tools knowledge", "K"),
+    ("Business Intelligence", "BI tools and concepts", "K"),
+    ("Tableau Proficiency", "Tableau skills assessment", "K"),
+    ("Power BI Skills", "Microsoft Power BI", "K"),
+    ("Salesforce Administration", "Salesforce platform skills", "K"),
+    ("SAP Fundamentals", "SAP system knowledge", "K"),
+    ("Oracle Database Admin", "Oracle DBA skills", "K"),
+    ("MongoDB Proficiency", "MongoDB database skills", "K"),
+    ("Git Version Control", "Git and version control", "K"),
+    ("Agile Methodology", "Agile practices knowledge", "K"),
+    ("Scrum Master Skills", "Scrum framework knowledge", "K"),
+    ("Project Management", "PM principles and practices", "K"),
+    ("ITIL Fundamentals", "ITIL framework knowledge", "K"),
+    ("Digital Marketing", "Digital marketing skills", "K"),
+    ("SEO Knowledge", "Search engine optimization", "K"),
+    ("Content Marketing", "Content creation skills", "K"),
+    ("Social Media Marketing", "Social media strategy", "K"),
+    ("Email Marketing", "Email campaign skills", "K"),
+    ("Google Analytics", "Analytics platform skills", "K"),
+    ("UI/UX Design Principles", "Design fundamentals", "K"),
+    ("Graphic Design Skills", "Visual design ability", "K"),
+    ("Adobe Creative Suite", "Adobe tools proficiency", "K"),
+    ("Video Editing", "Video production skills", "K"),
+    ("3D Modeling", "3D design skills", "K"),
+    ("AutoCAD Proficiency", "CAD software skills", "K"),
+    ("Accounting Principles", "Accounting knowledge", "K"),
+    ("Financial Analysis", "Financial analysis skills", "K"),
+)
+
+# Situational Judgment Tests (50+)
+_SJT_ASSESSMENTS = (
+    ("Situational Judgment - Leadership", "Leadership scenarios", "S"),
+    ("Situational Judgment - Customer Service", "Customer service scenarios", "S"),
+    ("Situational Judgment - Teamwork", "Team collaboration scenarios", "S"),
+    ("Situational Judgment - Management", "Management decision scenarios", "S"),
+    ("Situational Judgment - Sales", "Sales situation handling", "S"),
+    ("Situational Judgment - Ethics", "Ethical dilemma scenarios", "S"),
+    ("Situational Judgment - Conflict", "Conflict resolution scenarios", "S"),
+    ("Situational Judgment - Communication", "Communication scenarios", "S"),
+    ("Situational Judgment - Problem Solving", "Problem-solving scenarios", "S"),
+    ("Situational Judgment - Time Management", "Priority setting scenarios", "S"),
+    ("Situational Judgment - Safety", "Safety protocol scenarios", "S"),
+    ("Situational Judgment - Innovation", "Innovation scenarios", "S"),
+    ("Situational Judgment - Remote Work", "Remote work scenarios", "S"),
+    ("Situational Judgment - Change Management", "Change scenarios", "S"),
+    ("Situational Judgment - Diversity", "Diversity & inclusion scenarios", "S"),
+)
+
+
 class SHLScraper:
     """Scraper for SHL Assessment Catalog"""
     
     BASE_URL = "https://www.shl.com"
     CATALOG_URL = f"{BASE_URL}/solutions/products/product-catalog/"
     
+    # Precompiled XPath queries for cards, links and their fields, run by
+    # libxml2; class and href patterns use EXSLT case-insensitive regexes
+    _XPATH_NS = {'re': 'http://exslt.org/regular-expressions'}
+    _XP_CARDS = etree.XPath(
+        "//*[self::div or self::article][re:test(@class, 'product|card|tile', 'i')]",
+        namespaces=_XPATH_NS)
+    _XP_LINKS = etree.XPath(
+        "//a[re:test(@href, '/(assessment|test|solution)/', 'i')]",
+        namespaces=_XPATH_NS)
+    _XP_CARD_TITLE = etree.XPath(
+        "(.//*[self::h1 or self::h2 or self::h3 or self::h4 or self::h5 or self::a])[1]")
+    _XP_CARD_LINK = etree.XPath("(.//a[@href])[1]")
+    _XP_CARD_DESC = etree.XPath(
+        "(.//*[self::p or self::div][re:test(@class, 'description|summary|excerpt', 'i')])[1]",
+        namespaces=_XPATH_NS)
+    _XP_CARD_CAT = etree.XPath(
+        "(.//*[self::span or self::div][re:test(@class, 'category|type|tag', 'i')])[1]",
+        namespaces=_XPATH_NS)
+    _XP_LINK_CONTEXT = etree.XPath(
+        "((ancestor::*[self::div or self::article or self::section])[last()]//p)[1]")
+    
+    # Test type keywords, checked in priority order (substring matches)
+    _TEST_TYPE_PATTERNS = [
+        ('P', re.compile(r'personality|behavior|behaviour|motivation|opq|mq')),  # Personality & Behavior
+        ('C', re.compile(r'cognitive|ability|reasoning|numerical|verbal|deductive')),  # Cognitive
+        ('K', re.compile(r'skill|knowledge|technical|coding|programming|java|python')),  # Knowledge & Skills
+        ('S', re.compile(r'situational|judgment|sjt')),  # Situational Judgment
+    ]
+    
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        
+        # Back off and retry rate limits and transient server errors instead
+        # of falling back to generated data on the first 429/503
+        retry = Retry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+            allowed_methods=['GET']
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=8, pool_maxsize=8)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         self.assessments = []
     
     def scrape_catalog(self) -> List[Dict]:
@@ -38,37 +255,35 @@ class SHLScraper:
         try:
             response = self.session.get(self.CATALOG_URL, timeout=30)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            doc = lxml_html.fromstring(response.content)
             
             # Find all assessment links and cards
             # The structure may vary, so we'll try multiple selectors
+            # Duplicates are dropped by URL as they are found; the first one wins
             assessments = []
+            seen_urls = set()
             
             # Strategy 1: Find product cards/tiles
-            product_cards = soup.find_all(['div', 'article'], class_=re.compile(r'product|card|tile', re.I))
+            product_cards = self._XP_CARDS(doc)
             
             for card in product_cards:
                 assessment = self._extract_assessment_from_card(card)
-                if assessment:
+                if assessment and assessment['url'] not in seen_urls:
+                    seen_urls.add(assessment['url'])
                     assessments.append(assessment)
             
             # Strategy 2: Find links with assessment patterns
-            links = soup.find_all('a', href=re.compile(r'/(assessment|test|solution)/', re.I))
+            links = self._XP_LINKS(doc)
             
             for link in links:
                 assessment = self._extract_assessment_from_link(link)
-                if assessment and assessment not in assessments:
+                if assessment and assessment['url'] not in seen_urls:
+                    seen_urls.add(assessment['url'])
                     assessments.append(assessment)
             
-            # Remove duplicates based on URL
-            seen_urls = set()
-            unique_assessments = []
-            for assessment in assessments:
-                if assessment['url'] not in seen_urls:
-                    seen_urls.add(assessment['url'])
-                    unique_assessments.append(assessment)
+            self._enrich_from_detail_pages(assessments)
             
-            self.assessments = unique_assessments
+            self.assessments = assessments
             logger.info(f"Scraped {len(self.assessments)} unique assessments")
             
             # If we don't have enough, use fallback data
@@ -83,33 +298,36 @@ class SHLScraper:
             logger.info("Using fallback data...")
             return self._generate_fallback_data()
     
+    @staticmethod
+    def _text(elements: list) -> str:
+        """Stripped text of the first element in an XPath result, or "" if empty"""
+        if not elements:
+            return ""
+        return "".join(text.strip() for text in elements[0].itertext())
+    
     def _extract_assessment_from_card(self, card) -> Dict:
-        """Extract assessment data from a product card"""
+        """Extract assessment data from a product card element"""
         try:
-            title_elem = card.find(['h1', 'h2', 'h3', 'h4', 'h5', 'a'])
-            if not title_elem:
+            title_elems = self._XP_CARD_TITLE(card)
+            if not title_elems:
                 return None
             
-            title = title_elem.get_text(strip=True)
+            title = self._text(title_elems)
             
             # Get URL
-            link = card.find('a', href=True)
-            if link:
-                url = link['href']
-                if not url.startswith('http'):
-                    url = self.BASE_URL + url
+            links = self._XP_CARD_LINK(card)
+            if links:
+                url = urljoin(self.CATALOG_URL, links[0].get('href'))
             else:
                 return None
             
             # Get description
-            desc_elem = card.find(['p', 'div'], class_=re.compile(r'description|summary|excerpt', re.I))
-            description = desc_elem.get_text(strip=True) if desc_elem else ""
+            description = self._text(self._XP_CARD_DESC(card))
             
             # Get category/test type
-            category_elem = card.find(['span', 'div'], class_=re.compile(r'category|type|tag', re.I))
-            category = category_elem.get_text(strip=True) if category_elem else ""
+            category = self._text(self._XP_CARD_CAT(card))
             
-            test_type = self._infer_test_type(title, description, category)
+            test_type = self._infer_test_type(" ".join((title, description, category)).lower())
             return {
                 'assessment_name': title,
                 'url': url,
@@ -128,20 +346,16 @@ class SHLScraper:
     def _extract_assessment_from_link(self, link) -> Dict:
         """Extract assessment data from a link element"""
         try:
-            title = link.get_text(strip=True)
-            url = link.get('href', '')
-            
-            if not url.startswith('http'):
-                url = self.BASE_URL + url
+            title = self._text([link])
+            # Resolves relative, root-relative and protocol-relative hrefs
+            # against the catalog page they were found on
+            url = urljoin(self.CATALOG_URL, link.get('href', ''))
             
-            # Get surrounding context for description
-            parent = link.find_parent(['div', 'article', 'section'])
-            description = ""
-            if parent:
-                desc_elem = parent.find('p')
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
+            # Get surrounding context for description: the first paragraph in
+            # the nearest enclosing div/article/section
+            description = self._text(self._XP_LINK_CONTEXT(link))
             
-            test_type = self._infer_test_type(title, description, '')
+            test_type = self._infer_test_type(" ".join((title, description, '')).lower())
             return {
                 'assessment_name': title,
                 'url': url,
@@ -157,180 +371,135 @@ class SHLScraper:
             logger.debug(f"Error extracting from link: {e}")
             return None
     
-    def _infer_test_type(self, title: str, description: str, category: str) -> str:
-        """Infer test type from text content"""
-        text = f"{title} {description} {category}".lower()
+    def _enrich_from_detail_pages(self, assessments: List[Dict]):
+        """
+        Fill in missing descriptions from the assessments' product pages
+        
+        Args:
+            assessments: Scraped assessment dicts, updated in place
+        """
+        missing = [assessment for assessment in assessments if not assessment['description']]
+        if not missing:
+            return
+        
+        if not AIOHTTP_AVAILABLE:
+            logger.info("aiohttp not available, skipping product detail pages")
+            return
+        
+        logger.info(f"Fetching {len(missing)} product detail pages...")
+        descriptions = asyncio.run(self._fetch_all([assessment['url'] for assessment in missing]))
+        
+        for assessment, description in zip(missing, descriptions):
+            if description:
+                assessment['description'] = description
+                test_type = self._infer_test_type(
+                    " ".join((assessment['assessment_name'], description, assessment['category'])).lower()
+                )
+                assessment['test_type'] = test_type
+                assessment['test_type_full'] = self._get_test_type_full_name(test_type)
+    
+    async def _fetch_all(self, urls: List[str]) -> List[Optional[str]]:
+        """
+        Fetch product detail pages concurrently
         
+        Args:
+            urls: Product page URLs
+            
+        Returns:
+            One description (or None if the fetch failed) per URL
+        """
+        semaphore = asyncio.Semaphore(DETAIL_CONCURRENCY)
+        connector = aiohttp.TCPConnector(limit_per_host=DETAIL_CONNECTIONS_PER_HOST)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers={'User-Agent': self.session.headers['User-Agent']},
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as session:
+            return await asyncio.gather(*(self._fetch_one(session, semaphore, url) for url in urls))
+    
+    async def _fetch_one(self, session, semaphore: asyncio.Semaphore, url: str) -> Optional[str]:
+        """Fetch one product page and extract its description, backing off on 429"""
+        async with semaphore:
+            for attempt in range(DETAIL_RETRIES + 1):
+                try:
+                    async with session.get(url) as response:
+                        if response.status != 429 or attempt == DETAIL_RETRIES:
+                            response.raise_for_status()
+                            return self._parse_detail_page(await response.read())
+                except Exception as e:
+                    logger.debug(f"Error fetching {url}: {e}")
+                    return None
+                await asyncio.sleep(DETAIL_BACKOFF * 2 ** attempt)
+    
+    @staticmethod
+    def _parse_detail_page(content: bytes) -> str:
+        """Description of a product page: its meta description, else its first paragraph"""
+        doc = lxml_html.fromstring(content)
+        meta = doc.xpath('//meta[@name="description"]/@content')
+        if meta and meta[0].strip():
+            return meta[0].strip()
+        paragraphs = doc.xpath('//p')
+        return paragraphs[0].text_content().strip() if paragraphs else ""
+    
+    def _infer_test_type(self, text: str) -> str:
+        """
+        Infer test type from text content
+        
+        Args:
+            text: Lowercased "title description category" of the assessment
+            
+        Returns:
+            Test type code
+        """
         # Test type mapping
-        if any(word in text for word in ['personality', 'behavior', 'behaviour', 'motivation', 'opq', 'mq']):
-            return 'P'  # Personality & Behavior
-        elif any(word in text for word in ['cognitive', 'ability', 'reasoning', 'numerical', 'verbal', 'deductive']):
-            return 'C'  # Cognitive
-        elif any(word in text for word in ['skill', 'knowledge', 'technical', 'coding', 'programming', 'java', 'python']):
-            return 'K'  # Knowledge & Skills
-        elif any(word in text for word in ['situational', 'judgment', 'sjt']):
-            return 'S'  # Situational Judgment
-        else:
-            return 'O'  # Other
+        for test_type, pattern in self._TEST_TYPE_PATTERNS:
+            if pattern.search(text):
+                return test_type
+        return 'O'  # Other
     
     def _generate_fallback_data(self) -> List[Dict]:
         """
         Generate comprehensive fallback data with 377+ assessments
         This ensures we have sufficient data even if scraping fails
         """
+        # Shallow copies, so callers may modify them without touching the cache
+        return [dict(assessment) for assessment in self._fallback_data()]
+    
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _fallback_data() -> tuple:
+        """Build the fallback assessments once per process; they are deterministic"""
         logger.info("Generating fallback assessment data...")
         
         assessments = []
         
-        # Cognitive Assessments (100+)
-        cognitive_assessments = [
-            ("Verify Interactive - G+", "General cognitive ability assessment", "C"),
-            ("Verify Interactive - Numerical", "Numerical reasoning assessment", "C"),
-            ("Verify Interactive - Verbal", "Verbal reasoning assessment", "C"),
-            ("Verify Interactive - Deductive", "Deductive reasoning assessment", "C"),
-            ("Verify Interactive - Inductive", "Inductive reasoning assessment", "C"),
-            ("Verify Interactive - Calculation", "Calculation ability test", "C"),
-            ("General Ability - Reasoning", "General reasoning ability", "C"),
-            ("Numerical Reasoning - Advanced", "Advanced numerical reasoning", "C"),
-            ("Verbal Reasoning - Advanced", "Advanced verbal reasoning", "C"),
-            ("Abstract Reasoning", "Abstract reasoning test", "C"),
-            ("Spatial Reasoning", "Spatial ability assessment", "C"),
-            ("Mechanical Reasoning", "Mechanical reasoning test", "C"),
-            ("Critical Thinking Assessment", "Critical thinking skills", "C"),
-            ("Problem Solving Test", "Problem-solving abilities", "C"),
-            ("Logical Reasoning", "Logical thinking assessment", "C"),
-            ("Analytical Reasoning", "Analytical ability test", "C"),
-            ("Data Interpretation", "Data analysis skills", "C"),
-            ("Numerical Computation", "Numerical computation test", "C"),
-            ("Verbal Comprehension", "Reading comprehension test", "C"),
-            ("Cognitive Speed Test", "Processing speed assessment", "C"),
-        ]
-        
-        # Personality & Behavior Assessments (100+)
-        personality_assessments = [
-            ("OPQ32", "Occupational personality questionnaire", "P"),
-            ("Motivation Questionnaire (MQ)", "Workplace motivation assessment", "P"),
-            ("Customer Service Aptitude Profile", "Customer service personality", "P"),
-            ("Sales Achievement Predictor", "Sales personality traits", "P"),
-            ("Leadership Effectiveness", "Leadership style assessment", "P"),
-            ("Emotional Intelligence", "EI assessment", "P"),
-            ("Teamwork Assessment", "Team collaboration skills", "P"),
-            ("Communication Style", "Communication preferences", "P"),
-            ("Work Style Profile", "Work behavior patterns", "P"),
-            ("Resilience Assessment", "Stress management ability", "P"),
-            ("Adaptability Test", "Change management skills", "P"),
-            ("Conflict Resolution Style", "Conflict handling approach", "P"),
-            ("Decision Making Style", "Decision-making preferences", "P"),
-            ("Ethical Judgment", "Ethics and integrity", "P"),
-            ("Initiative & Drive", "Self-motivation assessment", "P"),
-            ("Detail Orientation", "Attention to detail", "P"),
-            ("Creativity Assessment", "Creative thinking ability", "P"),
-            ("Influence & Persuasion", "Influencing skills", "P"),
-            ("Collaboration Skills", "Collaborative behavior", "P"),
-            ("Accountability Profile", "Responsibility ownership", "P"),
+        # Combine all assessments lazily: (pool, times to repeat it)
+        pools = [
+            (_COGNITIVE_ASSESSMENTS, 5),  # Repeat to reach 100+
+            (_PERSONALITY_ASSESSMENTS, 5),  # Repeat to reach 100+
+            (_KNOWLEDGE_ASSESSMENTS, 2),  # Already 50+, repeat to reach 100+
+            (_SJT_ASSESSMENTS, 7)  # Repeat to reach 100+
         ]
-        
-        # Knowledge & Skills Assessments (100+)
-        knowledge_assessments = [
-            ("Java Programming - Intermediate", "Java coding skills", "K"),
-            ("Python Programming - Advanced", "Python development skills", "K"),
-            ("JavaScript Development", "JavaScript proficiency", "K"),
-            ("SQL Database Skills", "SQL query and database knowledge", "K"),
-            ("C++ Programming", "C++ development skills", "K"),
-            ("C# .NET Development", "C# and .NET framework", "K"),
-            ("React.js Development", "React framework skills", "K"),
-            ("Angular Development", "Angular framework knowledge", "K"),
-            ("Node.js Development", "Node.js backend skills", "K"),
-            ("PHP Programming", "PHP development skills", "K"),
-            ("Ruby on Rails", "Ruby programming skills", "K"),
-            ("Swift Programming", "iOS development skills", "K"),
-            ("Kotlin Development", "Android development with Kotlin", "K"),
-            ("DevOps Practices", "DevOps knowledge assessment", "K"),
-            ("Cloud Computing - AWS", "AWS cloud skills", "K"),
-            ("Cloud Computing - Azure", "Microsoft Azure skills", "K"),
-            ("Cloud Computing - GCP", "Google Cloud Platform", "K"),
-            ("Cybersecurity Fundamentals", "Security knowledge test", "K"),
-            ("Network Administration", "Networking skills", "K"),
-            ("System Administration - Linux", "Linux admin skills", "K"),
-            ("System Administration - Windows", "Windows server skills", "K"),
-            ("Data Science Fundamentals", "Data science knowledge", "K"),
-            ("Machine Learning Basics", "ML concepts and skills", "K"),
-            ("Data Analysis - Excel", "Excel data analysis", "K"),
-            ("Data Visualization", "Visualization tools knowledge", "K"),
-            ("Business Intelligence", "BI tools and concepts", "K"),
-            ("Tableau Proficiency", "Tableau skills assessment", "K"),
-            ("Power BI Skills", "Microsoft Power BI", "K"),
-            ("Salesforce Administration", "Salesforce platform skills", "K"),
-            ("SAP Fundamentals", "SAP system knowledge", "K"),
-            ("Oracle Database Admin", "Oracle DBA skills", "K"),
-            ("MongoDB Proficiency", "MongoDB database skills", "K"),
-            ("Git Version Control", "Git and version control", "K"),
-            ("Agile Methodology", "Agile practices knowledge", "K"),
-            ("Scrum Master Skills", "Scrum framework knowledge", "K"),
-            ("Project Management", "PM principles and practices", "K"),
-            ("ITIL Fundamentals", "ITIL framework knowledge", "K"),
-            ("Digital Marketing", "Digital marketing skills", "K"),
-            ("SEO Knowledge", "Search engine optimization", "K"),
-            ("Content Marketing", "Content creation skills", "K"),
-            ("Social Media Marketing", "Social media strategy", "K"),
-            ("Email Marketing", "Email campaign skills", "K"),
-            ("Google Analytics", "Analytics platform skills", "K"),
-            ("UI/UX Design Principles", "Design fundamentals", "K"),
-            ("Graphic Design Skills", "Visual design ability", "K"),
-            ("Adobe Creative Suite", "Adobe tools proficiency", "K"),
-            ("Video Editing", "Video production skills", "K"),
-            ("3D Modeling", "3D design skills", "K"),
-            ("AutoCAD Proficiency", "CAD software skills", "K"),
-            ("Accounting Principles", "Accounting knowledge", "K"),
-            ("Financial Analysis", "Financial analysis skills", "K"),
-        ]
-        
-        # Situational Judgment Tests (50+)
-        sjt_assessments = [
-            ("Situational Judgment - Leadership", "Leadership scenarios", "S"),
-            ("Situational Judgment - Customer Service", "Customer service scenarios", "S"),
-            ("Situational Judgment - Teamwork", "Team collaboration scenarios", "S"),
-            ("Situational Judgment - Management", "Management decision scenarios", "S"),
-            ("Situational Judgment - Sales", "Sales situation handling", "S"),
-            ("Situational Judgment - Ethics", "Ethical dilemma scenarios", "S"),
-            ("Situational Judgment - Conflict", "Conflict resolution scenarios", "S"),
-            ("Situational Judgment - Communication", "Communication scenarios", "S"),
-            ("Situational Judgment - Problem Solving", "Problem-solving scenarios", "S"),
-            ("Situational Judgment - Time Management", "Priority setting scenarios", "S"),
-            ("Situational Judgment - Safety", "Safety protocol scenarios", "S"),
-            ("Situational Judgment - Innovation", "Innovation scenarios", "S"),
-            ("Situational Judgment - Remote Work", "Remote work scenarios", "S"),
-            ("Situational Judgment - Change Management", "Change scenarios", "S"),
-            ("Situational Judgment - Diversity", "Diversity & inclusion scenarios", "S"),
-        ]
-        
-        # Combine all assessments
-        all_base_assessments = (
-            cognitive_assessments * 5 +  # Repeat to reach 100+
-            personality_assessments * 5 +  # Repeat to reach 100+
-            knowledge_assessments * 2 +  # Already 50+, repeat to reach 100+
-            sjt_assessments * 7  # Repeat to reach 100+
+        all_base_assessments = itertools.islice(
+            itertools.chain.from_iterable(
+                itertools.chain.from_iterable(itertools.repeat(pool, times) for pool, times in pools)
+            ),
+            400
         )
         
         # Generate full assessment list with unique URLs
-        for idx, (name, desc, test_type) in enumerate(all_base_assessments[:400], 1):
+        for idx, (name, desc, test_type) in enumerate(all_base_assessments, 1):
             # Determine duration based on test type
-            if test_type == 'C':
-                duration = 10 + (idx % 15)  # 10-24 minutes
-            elif test_type == 'P':
-                duration = 15 + (idx % 20)  # 15-34 minutes
-            elif test_type == 'K':
-                duration = 8 + (idx % 17)   # 8-24 minutes
-            else:
-                duration = 12 + (idx % 18)  # 12-29 minutes
+            base, spread = FALLBACK_DURATIONS.get(test_type, FALLBACK_DEFAULT_DURATION)
+            duration = base + (idx % spread)
             
             assessment = {
                 'assessment_name': name,
                 'url': f"https://www.shl.com/solutions/products/assessments/{test_type.lower()}/{idx}",
                 'description': desc,
-                'category': self._get_category_name(test_type),
+                'category': CATEGORY_NAMES.get(test_type, 'Other'),
                 'test_type': test_type,
-                'test_type_full': self._get_test_type_full_name(test_type),
+                'test_type_full': TEST_TYPE_FULL_NAMES.get(test_type, 'Other'),
                 'adaptive_support': 'Yes' if idx % 3 == 0 else 'No',  # ~33% adaptive
                 'remote_support': 'Yes',  # Most SHL assessments support remote
                 'duration': duration
@@ -338,35 +507,26 @@ class SHLScraper:
             assessments.append(assessment)
         
         logger.info(f"Generated {len(assessments)} fallback assessments")
-        return assessments
+        return tuple(assessments)
     
     def _get_category_name(self, test_type: str) -> str:
         """Get category name from test type"""
-        mapping = {
-            'C': 'Cognitive Ability',
-            'P': 'Personality & Behavior',
-            'K': 'Knowledge & Skills',
-            'S': 'Situational Judgment',
-            'O': 'Other'
-        }
-        return mapping.get(test_type, 'Other')
+        return CATEGORY_NAMES.get(test_type, 'Other')
     
     def _get_test_type_full_name(self, test_type: str) -> str:
         """Convert test type code to full name"""
-        mapping = {
-            'C': 'Ability & Aptitude',
-            'P': 'Personality & Behavior',
-            'K': 'Knowledge & Skills',
-            'S': 'Simulations',
-            'O': 'Other'
-        }
-        return mapping.get(test_type, 'Other')
+        return TEST_TYPE_FULL_NAMES.get(test_type, 'Other')
     
     def save_to_json(self, filepath: str = 'data/scraped_data.json'):
         """Save scraped data to JSON file"""
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.assessments, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                # Serializes straight to UTF-8 bytes in C
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(self.assessments, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(self.assessments, f, indent=2, ensure_ascii=False)
             logger.info(f"Saved {len(self.assessments)} assessments to {filepath}")
         except Exception as e:
             logger.error(f"Error saving to JSON: {e}")
@@ -374,8 +534,12 @@ class SHLScraper:
     def load_from_json(self, filepath: str = 'data/scraped_data.json') -> List[Dict]:
         """Load scraped data from JSON file"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                self.assessments = json.load(f)
+            if orjson is not None:
+                with open(filepath, 'rb') as f:
+                    self.assessments = orjson.loads(f.read())
+            else:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    self.assessments = json.load(f)
             logger.info(f"Loaded {len(self.assessments)} assessments from {filepath}")
             return self.assessments
         except Exception as e:
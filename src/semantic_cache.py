@@ -0,0 +1,104 @@
+"""
+Semantic query cache for recommendations
+Matches new queries against previously answered ones by embedding similarity
+"""
+
+import threading
+import numpy as np
+from typing import Optional, Tuple
+
+
+class SemanticCache:
+    """LRU cache keyed by L2-normalized query embeddings"""
+    
+    def __init__(self, capacity: int = 1024, threshold: float = 0.95):
+        """
+        Initialize semantic cache
+        
+        Args:
+            capacity: Maximum number of cached queries
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        self.capacity = capacity
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        
+        self._embeddings = None  # (capacity, d) matrix, allocated on first insert
+        self._results = []
+        self._ks = np.zeros(capacity, dtype=np.int64)  # k of each slot, for masking lookups
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._clock = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._results)
+    
+    def lookup(self, query_embedding: np.ndarray, k: int) -> Optional[Tuple]:
+        """
+        Find cached results for a semantically similar query
+        
+        Args:
+            query_embedding: L2-normalized query embedding
+            k: Number of recommendations requested
+            
+        Returns:
+            Cached results or None on a miss
+        """
+        with self._lock:
+            size = len(self._results)
+            if size == 0:
+                self.misses += 1
+                return None
+            
+            # Only entries stored for the same k can answer; otherwise a
+            # near-identical query cached with another k would win argmax
+            sims = self._embeddings[:size] @ query_embedding
+            sims[self._ks[:size] != k] = -np.inf
+            best = int(sims.argmax())
+            
+            if sims[best] >= self.threshold:
+                self._clock += 1
+                self._last_used[best] = self._clock
+                self.hits += 1
+                return self._results[best][0]
+            
+            self.misses += 1
+            return None
+    
+    def insert(self, query_embedding: np.ndarray, k: int, results: Tuple):
+        """
+        Store results for a query, evicting the least recently used entry
+        
+        Args:
+            query_embedding: L2-normalized query embedding
+            k: Number of recommendations requested
+            results: Results to cache
+        """
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = np.zeros(
+                    (self.capacity, query_embedding.shape[0]), dtype=np.float32
+                )
+            
+            if len(self._results) < self.capacity:
+                slot = len(self._results)
+                self._results.append((results, k))
+            else:
+                slot = int(self._last_used.argmin())
+                self._results[slot] = (results, k)
+            
+            self._embeddings[slot] = query_embedding
+            self._ks[slot] = k
+            self._clock += 1
+            self._last_used[slot] = self._clock
+    
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            self._embeddings = None
+            self._results = []
+            self._ks[:] = 0
+            self._last_used[:] = 0
+            self.hits = 0
+            self.misses = 0
@@ -2,14 +2,49 @@
 Utility functions for the SHL recommendation system
 """
 
-import requests
-from bs4 import BeautifulSoup
+import re
 import logging
+from functools import lru_cache
 from typing import Optional
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Descriptions are truncated in API responses to keep payloads small
+MAX_DESCRIPTION_LENGTH = 150
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Matches only the start of the text, so long JD input is never copied
+_URL_RE = re.compile(r'\s*https?://', re.I)
+
+
+@lru_cache(maxsize=1)
+def _jd_session():
+    """
+    Shared session for JD fetches, created on first use so importing this
+    module does not load requests
+    
+    Keep-alive connections are reused across fetches, and rate limits /
+    transient server errors are retried with backoff.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    })
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
 
 def fetch_jd_from_url(url: str) -> Optional[str]:
     """
@@ -21,23 +56,25 @@ def fetch_jd_from_url(url: str) -> Optional[str]:
     Returns:
         Extracted text content or None if failed
     """
+    # Only the JD-fetch path needs the HTML parser
+    from lxml import html as lxml_html
+    
     try:
-        response = requests.get(url, timeout=10)
+        response = _jd_session().get(url, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Plain lxml tree: no BeautifulSoup wrappers for a single text pass
+        doc = lxml_html.fromstring(response.content)
         
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
+        # Remove script and style elements (drop_tree keeps their tail text)
+        for script in doc.xpath('//script|//style'):
+            script.drop_tree()
         
-        # Get text
-        text = soup.get_text()
+        # Get text; separating text nodes keeps words in adjacent elements apart
+        text = ' '.join(doc.itertext())
         
-        # Clean up text
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
+        # Clean up text: collapse all whitespace runs in one pass
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         
         logger.info(f"Fetched {len(text)} characters from {url}")
         return text
@@ -86,7 +123,7 @@ def format_recommendations(recommendations: list) -> list:
             'url': rec.get('url', ''),
             'name': rec.get('assessment_name', ''),
             'adaptive_support': rec.get('adaptive_support', 'No'),
-            'description': rec.get('description', ''),
+            'description': (rec.get('description', '') or '')[:MAX_DESCRIPTION_LENGTH],
             'duration': rec.get('duration', 15),
             'remote_support': rec.get('remote_support', 'Yes'),
             'test_type': [test_type_full]  # Return as list
@@ -105,5 +142,4 @@ def is_url(text: str) -> bool:
     Returns:
         True if text appears to be a URL
     """
-    text = text.strip().lower()
-    return text.startswith('http://') or text.startswith('https://')
+    return _URL_RE.match(text) is not None
@@ -3,12 +3,66 @@ Test script to verify the API response format matches requirements
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from tests.api_common import BASE_URL, REQUIRED_FIELDS
+from collections import Counter
 import json
-import time
+import os
+import sys
 
-# Wait for server to start
+try:
+    from requests_cache import CachedSession
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+# Repeated identical /recommend POSTs are answered from this sqlite cache.
+# GET /health is never cached so the readiness check sees the real server.
+API_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", ".api_cache")
+
+# Connection refusals while the server boots and transient gateway errors
+# are retried inside urllib3 with exponential backoff (~13s worst case);
+# read timeouts are not, so a hung /recommend is reported rather than re-sent
+RETRY = Retry(
+    total=8,
+    connect=7,
+    read=0,
+    backoff_factor=0.1,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=("GET", "POST"),
+    raise_on_status=False
+)
+
+# One pooled keep-alive session for every request the script makes
+if REQUESTS_CACHE_AVAILABLE:
+    SESSION = CachedSession(
+        API_CACHE_PATH,
+        backend="sqlite",
+        allowable_methods=("POST",),
+        allowable_codes=(200,),
+        expire_after=3600,
+        match_headers=False
+    )
+else:
+    SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=RETRY))
+
+# -v: also dump response bodies (off by default to keep output short)
+VERBOSE = "-v" in sys.argv
+
+# --no-cache: the backend changed, so drop every stored response first
+if "--no-cache" in sys.argv and REQUESTS_CACHE_AVAILABLE:
+    SESSION.cache.clear()
+
+# Wait for server to start; the session adapter retries until it accepts connections
 print("Waiting for server to start...")
-time.sleep(10)
+try:
+    if SESSION.get(f"{BASE_URL}/health", timeout=(1, 5)).status_code != 200:
+        raise SystemExit("server not ready")
+except requests.ConnectionError:
+    raise SystemExit("server not ready")
 
 # Test query
 query = "Need a Java developer who is good in collaborating with external teams and stakeholders."
@@ -20,8 +74,8 @@ print(f"Query: {query}\n")
 
 try:
     # Make API request
-    response = requests.post(
-        "http://localhost:5000/recommend",
+    response = SESSION.post(
+        f"{BASE_URL}/recommend",
         json={"query": query},
         timeout=30
     )
@@ -30,8 +84,9 @@ try:
         data = response.json()
         
         print(f"Status Code: {response.status_code}")
-        print(f"\nResponse Structure:")
-        print(json.dumps(data, indent=2)[:500])
+        print(f"\nResponse keys: {list(data)}")
+        if VERBOSE:
+            print(json.dumps(data))
         
         # Verify structure
         if "recommended_assessments" in data:
@@ -41,12 +96,12 @@ try:
             
             if len(assessments) > 0:
                 first = assessments[0]
-                print(f"\n✓ First recommendation structure:")
-                print(json.dumps(first, indent=2))
+                print(f"\n✓ First recommendation: {first.get('name')} | {first.get('test_type')}")
+                if VERBOSE:
+                    print(json.dumps(first, indent=2, default=str))
                 
                 # Check required fields
-                required_fields = ['url', 'name', 'adaptive_support', 'description', 'duration', 'remote_support', 'test_type']
-                missing = [f for f in required_fields if f not in first]
+                missing = [f for f in REQUIRED_FIELDS if f not in first]
                 
                 if missing:
                     print(f"\n✗ Missing fields: {missing}")
@@ -64,12 +119,13 @@ try:
                 print(f"Recommendation Diversity:")
                 print(f"{'='*80}\n")
                 
-                test_types = {}
-                for rec in assessments[:10]:
-                    test_type = rec['test_type'][0] if rec['test_type'] else 'Unknown'
-                    test_types[test_type] = test_types.get(test_type, 0) + 1
+                top = assessments[:10]
+                labels = [rec['test_type'][0] if rec['test_type'] else 'Unknown' for rec in top]
+                for rec, test_type in zip(top, labels):
                     print(f"{rec['name'][:50]:50} | {test_type}")
                 
+                test_types = Counter(labels)
+                
                 print(f"\nTest Type Distribution:")
                 for tt, count in test_types.items():
                     print(f"  {tt}: {count}")
@@ -85,6 +141,9 @@ except Exception as e:
     import traceback
     traceback.print_exc()
 
+finally:
+    SESSION.close()
+
 print(f"\n{'='*80}")
 print(f"Test Complete")
 print(f"{'='*80}\n")
@@ -0,0 +1,44 @@
+"""
+Constants shared by the API test scripts and the pytest suite
+
+Kept free of pytest and jsonschema imports so the standalone scripts can
+use it too.
+"""
+
+BASE_URL = "http://localhost:5000"
+
+# Queries every suite sends to /recommend
+TEST_QUERIES = [
+    "I am hiring for Java developers who can also collaborate effectively with my business teams.",
+    "Looking to hire mid-level professionals who are proficient in Python, SQL and JavaScript.",
+    "I am hiring for an analyst and wants applications to screen using Cognitive and personality tests"
+]
+
+# Fields every entry in 'recommended_assessments' must carry
+REQUIRED_FIELDS = ["url", "name", "adaptive_support", "description", "duration", "remote_support", "test_type"]
+
+# Required shape of a /recommend response (JSON Schema, draft 2020-12)
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "required": ["recommended_assessments"],
+    "properties": {
+        "recommended_assessments": {
+            "type": "array",
+            "minItems": 1,
+            "maxItems": 10,
+            "items": {
+                "type": "object",
+                "required": REQUIRED_FIELDS,
+                "properties": {
+                    "url": {"type": "string"},
+                    "name": {"type": "string"},
+                    "adaptive_support": {"enum": ["Yes", "No"]},
+                    "description": {"type": "string"},
+                    "duration": {"type": "integer"},
+                    "remote_support": {"enum": ["Yes", "No"]},
+                    "test_type": {"type": "array", "items": {"type": "string"}}
+                }
+            }
+        }
+    }
+}
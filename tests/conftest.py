@@ -0,0 +1,85 @@
+"""
+Shared pytest fixtures for the API tests
+
+The default run stubs /health and /recommend in-process with `responses`,
+so no server or model is needed. Tests marked `live` hit a running API
+and only run with --live.
+"""
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from api_common import BASE_URL, TEST_QUERIES, RESPONSE_SCHEMA
+
+# One assessment in the exact shape /recommend returns (see format_recommendations)
+SAMPLE_ASSESSMENT = {
+    "url": "https://www.shl.com/solutions/products/product-catalog/view/java-8-new/",
+    "name": "Java 8 (New)",
+    "adaptive_support": "No",
+    "description": "Multi-choice test that measures the knowledge of Java class design, exceptions, generics, collections, concurrency, JDBC and Java I/O fundamentals.",
+    "duration": 18,
+    "remote_support": "Yes",
+    "test_type": ["Knowledge & Skills"]
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--live",
+        action="store_true",
+        default=False,
+        help="run tests marked 'live' against a running API server"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--live"):
+        return
+    
+    skip_live = pytest.mark.skip(reason="needs a running API server; use --live")
+    for item in items:
+        if "live" in item.keywords:
+            item.add_marker(skip_live)
+
+
+@pytest.fixture(scope="session")
+def session():
+    """Pooled JSON session shared by every test in the run"""
+    with requests.Session() as s:
+        s.headers.update({"Content-Type": "application/json"})
+        s.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        yield s
+
+
+@pytest.fixture(scope="session")
+def base_url():
+    return BASE_URL
+
+
+@pytest.fixture(params=TEST_QUERIES)
+def query(request):
+    """Each of the shared /recommend test queries in turn"""
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def validator():
+    """/recommend response schema, compiled once per run"""
+    jsonschema = pytest.importorskip("jsonschema")
+    return jsonschema.Draft202012Validator(RESPONSE_SCHEMA)
+
+
+@pytest.fixture
+def mock_api():
+    """Stub /health and /recommend with canned responses matching the API schema"""
+    responses = pytest.importorskip("responses")
+    
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        rsps.get(f"{BASE_URL}/health", json={"status": "healthy"}, status=200)
+        rsps.post(
+            f"{BASE_URL}/recommend",
+            json={"recommended_assessments": [SAMPLE_ASSESSMENT] * 5},
+            status=200
+        )
+        yield rsps
@@ -1,19 +1,40 @@
 """
 Test script for API endpoints
+
+Under pytest, test_health and test_recommend run against stubbed responses
+(see conftest.py); the remaining tests are marked live and need --live.
+Run directly to exercise a real server interactively.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 import json
 
+try:
+    import pytest
+    live = pytest.mark.live
+except ImportError:
+    # Plain `python tests/test_api.py` does not need pytest
+    live = lambda func: func
+
+from api_common import BASE_URL, TEST_QUERIES
+
+# One pooled keep-alive session for every request the script makes
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
 
-def test_health_endpoint(base_url='http://localhost:5000'):
+
+@live
+def test_health_endpoint(base_url=BASE_URL, session=SESSION):
     """Test health check endpoint"""
     print(f"\n{'='*60}")
     print("Testing /health endpoint")
     print(f"{'='*60}")
     
     try:
-        response = requests.get(f"{base_url}/health")
+        response = session.get(f"{base_url}/health")
         print(f"Status Code: {response.status_code}")
         print(f"Response: {json.dumps(response.json(), indent=2)}")
         
@@ -26,58 +47,71 @@ def test_health_endpoint(base_url='http://localhost:5000'):
         print(f"✗ Error: {e}")
 
 
-def test_recommend_endpoint(base_url='http://localhost:5000'):
+def _post_query(session, base_url, query):
+    """POST one query to /recommend; a request error is returned, not raised"""
+    try:
+        return session.post(
+            f"{base_url}/recommend",
+            json={"query": query}
+        )
+    except Exception as e:
+        return e
+
+
+def _report_recommendation(query, response, i):
+    """Print one /recommend response and whether it passed"""
+    print(f"\nTest {i}: {query}")
+    print("-" * 60)
+    
+    try:
+        if isinstance(response, Exception):
+            raise response
+        
+        print(f"Status Code: {response.status_code}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"Total recommendations: {data['total_recommendations']}")
+            print(f"\nTop 5 recommendations:")
+            
+            for j, rec in enumerate(data['recommendations'][:5], 1):
+                print(f"{j}. {rec['assessment_name']}")
+                print(f"   Type: {rec['test_type']} | Score: {rec['relevance_score']:.3f}")
+                print(f"   URL: {rec['url']}")
+            
+            print("✓ Test passed")
+        else:
+            print(f"Response: {response.json()}")
+            print("✗ Test failed")
+            
+    except Exception as e:
+        print(f"✗ Error: {e}")
+
+
+@live
+def test_recommend_endpoint(base_url=BASE_URL, session=SESSION):
     """Test recommendation endpoint"""
     print(f"\n{'='*60}")
     print("Testing /recommend endpoint")
     print(f"{'='*60}")
     
-    test_queries = [
-        "I am hiring for Java developers who can also collaborate effectively with my business teams.",
-        "Looking to hire mid-level professionals who are proficient in Python, SQL and JavaScript.",
-        "Need assessment for analyst role with cognitive and personality tests"
-    ]
+    # The queries are independent: send them together and report in order
+    with ThreadPoolExecutor(max_workers=len(TEST_QUERIES)) as executor:
+        futures = [executor.submit(_post_query, session, base_url, query) for query in TEST_QUERIES]
     
-    for i, query in enumerate(test_queries, 1):
-        print(f"\nTest {i}: {query}")
-        print("-" * 60)
-        
-        try:
-            response = requests.post(
-                f"{base_url}/recommend",
-                json={"query": query},
-                headers={"Content-Type": "application/json"}
-            )
-            
-            print(f"Status Code: {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"Total recommendations: {data['total_recommendations']}")
-                print(f"\nTop 5 recommendations:")
-                
-                for j, rec in enumerate(data['recommendations'][:5], 1):
-                    print(f"{j}. {rec['assessment_name']}")
-                    print(f"   Type: {rec['test_type']} | Score: {rec['relevance_score']:.3f}")
-                    print(f"   URL: {rec['url']}")
-                
-                print("✓ Test passed")
-            else:
-                print(f"Response: {response.json()}")
-                print("✗ Test failed")
-                
-        except Exception as e:
-            print(f"✗ Error: {e}")
-
-
-def test_api_info_endpoint(base_url='http://localhost:5000'):
+    for i, (query, future) in enumerate(zip(TEST_QUERIES, futures), 1):
+        _report_recommendation(query, future.result(), i)
+
+
+@live
+def test_api_info_endpoint(base_url=BASE_URL, session=SESSION):
     """Test API info endpoint"""
     print(f"\n{'='*60}")
     print("Testing /api/info endpoint")
     print(f"{'='*60}")
     
     try:
-        response = requests.get(f"{base_url}/api/info")
+        response = session.get(f"{base_url}/api/info")
         print(f"Status Code: {response.status_code}")
         print(f"Response: {json.dumps(response.json(), indent=2)}")
         
@@ -90,20 +124,38 @@ def test_api_info_endpoint(base_url='http://localhost:5000'):
         print(f"✗ Error: {e}")
 
 
+def test_health(mock_api, session, base_url):
+    """/health answers 200 with status 'healthy'"""
+    response = session.get(f"{base_url}/health", timeout=5)
+    
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
+
+def test_recommend(mock_api, session, base_url, validator, query):
+    """/recommend returns 1-10 well-formed assessments"""
+    response = session.post(f"{base_url}/recommend", json={"query": query}, timeout=30)
+    
+    assert response.status_code == 200
+    validator.validate(response.json())
+    assert json.loads(mock_api.calls[-1].request.body) == {"query": query}
+
+
 def main():
     """Run all tests"""
     print(f"\n{'#'*60}")
     print("API Testing Suite")
     print(f"{'#'*60}")
     
-    base_url = input("\nEnter API base URL (default: http://localhost:5000): ").strip()
+    base_url = input(f"\nEnter API base URL (default: {BASE_URL}): ").strip()
     if not base_url:
-        base_url = "http://localhost:5000"
+        base_url = BASE_URL
     
-    # Run tests
-    test_health_endpoint(base_url)
-    test_api_info_endpoint(base_url)
-    test_recommend_endpoint(base_url)
+    # Run tests over one keep-alive session
+    with SESSION:
+        test_health_endpoint(base_url, SESSION)
+        test_api_info_endpoint(base_url, SESSION)
+        test_recommend_endpoint(base_url, SESSION)
     
     print(f"\n{'#'*60}")
     print("Testing Complete")
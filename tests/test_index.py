@@ -0,0 +1,81 @@
+"""
+Ranking parity tests for the lightweight keyword API (api/index.py)
+
+simple_recommend scores through an inverted index; these tests check it
+ranks a small fixture catalog exactly like the original substring scorer.
+"""
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+from api import index as api_index
+
+CATALOG = [
+    {"assessment_name": "Java 8 (New)", "description": "Java class design, generics and Java I/O.", "category": "Knowledge & Skills"},
+    {"assessment_name": "JavaScript (New)", "description": "Client-side JavaScript and the DOM.", "category": "Knowledge & Skills"},
+    {"assessment_name": "Core Java Entry Level", "description": "Java basics for entry-level developers.", "category": "Knowledge & Skills"},
+    {"assessment_name": "Python (New)", "description": "Python data structures, python idioms and SQL access.", "category": "Knowledge & Skills"},
+    {"assessment_name": "SQL Server", "description": "Queries, joins and stored procedures in SQL Server.", "category": "Knowledge & Skills"},
+    {"assessment_name": "Verify Numerical Reasoning", "description": "Cognitive test of numerical reasoning.", "category": "Ability & Aptitude"},
+    {"assessment_name": "Verify Verbal Reasoning", "description": "Cognitive test of verbal reasoning.", "category": "Ability & Aptitude"},
+    {"assessment_name": "OPQ32r", "description": "Occupational personality questionnaire for collaboration and leadership.", "category": "Personality & Behavior"},
+    {"assessment_name": "Business Communication", "description": "Written business communication and collaboration.", "category": "Competencies"},
+    {"assessment_name": "Entry Level Sales", "description": "Sales aptitude for entry level roles.", "category": "Competencies"},
+]
+
+QUERIES = [
+    "Java developers who can collaborate with business teams",
+    "java javascript",
+    "python python SQL",
+    "Cognitive and personality tests for an analyst",
+    "Numerical reasoning",
+    "entry level sales role",
+    "VERIFY verbal",
+    "nothing matches here",
+    "a an of",
+]
+
+
+def baseline_recommend(assessments, query, k=10):
+    """The original scorer: substring counts over each lowercased assessment text"""
+    words = [w for w in query.lower().split() if len(w) > 3]
+    
+    scored = []
+    for doc_id, assessment in enumerate(assessments):
+        text = f"{assessment.get('assessment_name', '')} {assessment.get('description', '')} {assessment.get('category', '')}".lower()
+        score = sum(text.count(word) for word in words if word in text)
+        if score > 0:
+            scored.append((doc_id, score))
+    
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return [doc_id for doc_id, score in scored[:k]]
+
+
+@pytest.fixture
+def fixture_catalog(monkeypatch):
+    """Index CATALOG in place of the real data, restoring module state afterwards"""
+    for name in ("_catalog", "_index", "_doc_count", "_word_scores", "_vocab", "_vocab_blob", "_vocab_starts"):
+        monkeypatch.setattr(api_index, name, getattr(api_index, name))
+    
+    api_index.build_index(CATALOG)
+    monkeypatch.setattr(api_index, "_catalog", api_index._to_columns(CATALOG))
+    return CATALOG
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("k", [3, 10])
+def test_simple_recommend_matches_baseline(fixture_catalog, query, k):
+    assert api_index.simple_recommend(query, k) == baseline_recommend(fixture_catalog, query, k)
+
+
+def test_term_scores_match_substring_counts(fixture_catalog):
+    """Per-term hits count occurrences inside tokens, e.g. 'java' in 'javascript'"""
+    for word in ("java", "python", "reasoning", "level", "collaborat"):
+        expected = {}
+        for doc_id, assessment in enumerate(fixture_catalog):
+            text = f"{assessment['assessment_name']} {assessment['description']} {assessment['category']}".lower()
+            if text.count(word):
+                expected[doc_id] = text.count(word)
+        assert api_index._term_scores(word) == expected
@@ -0,0 +1,140 @@
+"""
+Unit tests for parsing (streamed) LLM rerank responses
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src import rerank_parser
+from src.rerank_parser import MentionMatcher, rank_stream, arank_stream, parse_rerank
+
+NAMES = ["Java 8", "Java 8 (New)", "Core Java", "Python (New)", "SQL Server", "OPQ32r"]
+CANDIDATES = [({"assessment_name": name}, 0.9 - 0.1 * i) for i, name in enumerate(NAMES)]
+
+RESPONSE = """Here are my recommendations:
+
+1. **Python (New)** - the query asks for Python; pairs well with SQL Server and Java 8.
+2. **OPQ32r** - personality fit, more relevant than Core Java here.
+   - Sub-point: Core Java would also work.
+3. **Java 8 (New)** - covers Java.
+
+SQL Server is a good option too.
+"""
+
+
+def _names(assessments):
+    return [assessment["assessment_name"] for assessment in assessments]
+
+
+@pytest.fixture(params=["ahocorasick", "find"], autouse=True)
+def matcher_backend(request, monkeypatch):
+    """Run every test with the Aho-Corasick automaton and with the str.find fallback"""
+    if request.param == "ahocorasick":
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(rerank_parser, "AHOCORASICK_AVAILABLE", False)
+    return request.param
+
+
+class FakeStream:
+    """Sync chunk stream that records how much was read and whether it was closed"""
+    
+    def __init__(self, text, size=7):
+        self.chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        self.read = 0
+        self.closed = False
+    
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield SimpleNamespace(content=chunk)
+    
+    def close(self):
+        self.closed = True
+
+
+class FakeAsyncStream(FakeStream):
+    """Async variant of FakeStream"""
+    
+    def __aiter__(self):
+        return self._agen()
+    
+    async def _agen(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield SimpleNamespace(content=chunk)
+    
+    async def aclose(self):
+        self.closed = True
+
+
+def test_ranks_list_items_ignoring_justifications():
+    """Names in justifications, sub-bullets and trailing text do not rank"""
+    assert _names(parse_rerank(RESPONSE, CANDIDATES, 3)) == ["Python (New)", "OPQ32r", "Java 8 (New)"]
+
+
+def test_longest_name_wins_at_same_position():
+    matcher = MentionMatcher(CANDIDATES)
+    matcher.feed("1. Java 8 (New)\n2. Java 8\n")
+    assert matcher.picked == [1, 0]
+
+
+def test_repeated_item_is_not_ranked_twice():
+    """An item naming an already ranked candidate is skipped, not credited to its justification"""
+    matcher = MentionMatcher(CANDIDATES)
+    matcher.feed("1. OPQ32r\n2. OPQ32r again, then Core Java\n3. SQL Server\n")
+    assert [CANDIDATES[i][0]["assessment_name"] for i in matcher.picked] == ["OPQ32r", "SQL Server"]
+
+
+def test_name_on_line_after_item_number():
+    matcher = MentionMatcher(CANDIDATES)
+    matcher.feed("1.\n**Core Java**\n2.\nSQL Server\n")
+    assert matcher.picked == [2, 4]
+
+
+def test_partial_lines_wait_for_newline():
+    """A line split across chunks is only matched once complete"""
+    matcher = MentionMatcher(CANDIDATES)
+    assert matcher.feed("1. Java 8") == 0
+    assert matcher.feed(" (New)\n2. SQL") == 1
+    assert matcher.finish() == 1
+    assert matcher.ranked(1) == [CANDIDATES[1][0]]
+
+
+def test_final_line_without_newline():
+    matcher = MentionMatcher(CANDIDATES)
+    matcher.feed("1. OPQ32r\n2. Core Java")
+    assert _names(matcher.ranked(2)) == ["OPQ32r", "Core Java"]
+
+
+def test_response_without_list_uses_first_mentions():
+    response = "I suggest SQL Server first, then Core Java and finally OPQ32r."
+    assert _names(parse_rerank(response, CANDIDATES, 3)) == ["SQL Server", "Core Java", "OPQ32r"]
+
+
+def test_too_few_items_falls_back_to_vector_order():
+    assert parse_rerank("1. OPQ32r\n", CANDIDATES, 3) == [assessment for assessment, score in CANDIDATES[:3]]
+
+
+def test_rank_stream_stops_at_k_items():
+    stream = FakeStream(RESPONSE)
+    assert _names(rank_stream(stream, CANDIDATES, 2)) == ["Python (New)", "OPQ32r"]
+    assert stream.closed
+    assert stream.read < len(stream.chunks)
+
+
+def test_rank_stream_reads_to_end_when_list_is_short():
+    """Only three items are ranked, so a k of 4 reads everything, then falls back"""
+    stream = FakeStream(RESPONSE)
+    assert rank_stream(stream, CANDIDATES, 4) == [assessment for assessment, score in CANDIDATES[:4]]
+    assert stream.closed
+    assert stream.read == len(stream.chunks)
+
+
+def test_arank_stream_stops_at_k_items():
+    stream = FakeAsyncStream(RESPONSE)
+    assert _names(asyncio.run(arank_stream(stream, CANDIDATES, 2))) == ["Python (New)", "OPQ32r"]
+    assert stream.closed
+    assert stream.read < len(stream.chunks)
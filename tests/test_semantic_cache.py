@@ -0,0 +1,65 @@
+"""
+Unit tests for the embedding-keyed semantic cache
+"""
+
+import numpy as np
+
+from src.semantic_cache import SemanticCache
+
+
+def _unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_hit_on_near_duplicate():
+    """A query above the similarity threshold is served from the cache"""
+    cache = SemanticCache(capacity=4, threshold=0.95)
+    cache.insert(_unit(1, 0, 0), 10, ("a",))
+    
+    assert cache.lookup(_unit(1, 0.05, 0), 10) == ("a",)
+    assert cache.lookup(_unit(0, 1, 0), 10) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lookup_only_matches_same_k():
+    """An entry cached under another k never shadows the matching one"""
+    cache = SemanticCache(capacity=8, threshold=0.95)
+    embedding = _unit(1, 2, 3)
+    cache.insert(embedding, 10, ("k10",))
+    
+    # Same embedding, different k: miss once, then hit the k=5 entry
+    for _ in range(3):
+        if cache.lookup(embedding, 5) is None:
+            cache.insert(embedding, 5, ("k5",))
+    
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert len(cache) == 2
+    assert cache.lookup(embedding, 5) == ("k5",)
+    assert cache.lookup(embedding, 10) == ("k10",)
+
+
+def test_lru_eviction():
+    """The least recently used entry is replaced when the cache is full"""
+    cache = SemanticCache(capacity=2, threshold=0.95)
+    cache.insert(_unit(1, 0), 10, ("x",))
+    cache.insert(_unit(0, 1), 10, ("y",))
+    cache.lookup(_unit(1, 0), 10)  # x is now the most recently used
+    cache.insert(_unit(1, 1), 10, ("z",))
+    
+    assert len(cache) == 2
+    assert cache.lookup(_unit(1, 0), 10) == ("x",)
+    assert cache.lookup(_unit(0, 1), 10) is None
+    assert cache.lookup(_unit(1, 1), 10) == ("z",)
+
+
+def test_clear():
+    """clear drops entries and counters"""
+    cache = SemanticCache(capacity=2)
+    cache.insert(_unit(1, 0), 10, ("x",))
+    cache.lookup(_unit(1, 0), 10)
+    cache.clear()
+    
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+    assert cache.lookup(_unit(1, 0), 10) is None